@@ -2,12 +2,124 @@
 Knowledge graph generation for experiment relationships
 """
 import asyncio
-from typing import Dict, List, Set, Tuple
+import copy
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 import json
 from collections import defaultdict
-import numpy as np
+from functools import lru_cache
+
+# Maps spaces and hyphens to underscores when building node ids
+_ID_TRANS = str.maketrans({' ': '_', '-': '_'})
+
+# Cytoscape styling for the graph; static, so built once at import
+_GRAPH_STYLE = [
+    {
+        'selector': 'node',
+        'style': {
+            'background-color': 'data(color)',
+            'label': 'data(label)',
+            'width': 'data(size)',
+            'height': 'data(size)',
+            'text-valign': 'center',
+            'text-halign': 'center',
+            'color': '#ffffff',
+            'font-size': '10px',
+            'font-family': 'Inter, sans-serif'
+        }
+    },
+    {
+        'selector': 'node[type="experiment"]',
+        'style': {
+            'shape': 'rectangle',
+            'border-width': 2,
+            'border-color': '#ffffff'
+        }
+    },
+    {
+        'selector': 'node[type="organism"]',
+        'style': {
+            'shape': 'ellipse'
+        }
+    },
+    {
+        'selector': 'node[type="mission"]',
+        'style': {
+            'shape': 'diamond'
+        }
+    },
+    {
+        'selector': 'node[type="keyword"]',
+        'style': {
+            'shape': 'triangle'
+        }
+    },
+    {
+        'selector': 'edge',
+        'style': {
+            'width': 2,
+            'line-color': '#6366F1',
+            'target-arrow-color': '#6366F1',
+            'target-arrow-shape': 'triangle',
+            'curve-style': 'bezier',
+            'opacity': 0.7
+        }
+    },
+    {
+        'selector': 'edge[type="similarity"]',
+        'style': {
+            'line-style': 'dashed',
+            'line-color': '#10B981',
+            'target-arrow-color': '#10B981'
+        }
+    }
+]
+
+# Mock experiments data for demo
+_MOCK_EXPERIMENTS = [
+    {
+        'id': 'GLDS-21',
+        'title': 'Spaceflight Effects on Arabidopsis Gene Expression',
+        'organism': 'Arabidopsis thaliana',
+        'mission': 'STS-131',
+        'keywords': ['microgravity', 'gene expression', 'plants', 'spaceflight']
+    },
+    {
+        'id': 'GLDS-47',
+        'title': 'Muscle Atrophy in Microgravity',
+        'organism': 'Mus musculus',
+        'mission': 'Rodent Research-1',
+        'keywords': ['muscle atrophy', 'microgravity', 'protein degradation']
+    },
+    {
+        'id': 'GLDS-173',
+        'title': 'Microbial Communities in Space',
+        'organism': 'Escherichia coli',
+        'mission': 'ISS Expedition-45',
+        'keywords': ['microbiome', 'bacteria', 'space adaptation']
+    },
+    {
+        'id': 'GLDS-242',
+        'title': 'Bone Density Changes in Astronauts',
+        'organism': 'Homo sapiens',
+        'mission': 'ISS Long Duration',
+        'keywords': ['bone density', 'calcium', 'osteoporosis']
+    }
+]
+
+# Experiment id -> position in _MOCK_EXPERIMENTS
+_MOCK_POSITION_BY_ID = {exp['id']: position for position, exp in enumerate(_MOCK_EXPERIMENTS)}
 
 class KnowledgeGraphGenerator:
+    # Shared (type, size, color) payloads for each node type
+    _EXPERIMENT_STYLE = ('experiment', 25, '#0B3D91')
+    _ORGANISM_STYLE = ('organism', 20, '#EF4444')
+    _MISSION_STYLE = ('mission', 18, '#6366F1')
+    _KEYWORD_STYLE = ('keyword', 15, '#10B981')
+
+    # Field order of node and edge rows
+    _NODE_FIELDS = ('id', 'label', 'type', 'size', 'color')
+    _EDGE_FIELDS = ('id', 'source', 'target', 'label', 'type', 'style')
+
     def __init__(self):
         self.relationship_types = {
             'organism': 'studied_in',
@@ -16,118 +128,69 @@ class KnowledgeGraphGenerator:
             'outcome': 'results_in',
             'keyword': 'related_to'
         }
+        
+        # Graphs are memoized per generator instance, keyed by the frozen id set
+        self._cached_graph = lru_cache(maxsize=128)(self._build_graph)
     
     async def generate_graph(self, experiment_ids: List[str]) -> Dict:
-        """Generate knowledge graph data for given experiments"""
+        """Generate knowledge graph data for given experiments
+        
+        The graph only depends on which experiments are requested, so it's built
+        once per id set; each caller gets its own copy of the cached graph.
+        """
+        return copy.deepcopy(self._cached_graph(frozenset(experiment_ids or ())))
+    
+    def _build_graph(self, experiment_ids: FrozenSet[str]) -> Dict:
+        """Build the knowledge graph for a set of experiment ids"""
+        # For MVP, create mock graph data
+        # In production, this would analyze actual experiment data
+        return self._graph_for_experiments(self._get_mock_experiments(list(experiment_ids)))
+    
+    def _graph_for_experiments(self, experiments: List[Dict]) -> Dict:
+        """Build the knowledge graph for a list of experiment records"""
         try:
-            # For MVP, create mock graph data
-            # In production, this would analyze actual experiment data
-            
-            nodes = []
-            edges = []
+            # Nodes and edges are kept as positional tuple rows and only expanded
+            # into Cytoscape's {'data': {...}} shape when the payload is returned
+            node_rows = []  # rows of _NODE_FIELDS
+            edge_rows = []  # rows of _EDGE_FIELDS
             node_ids = set()
             
-            # Mock experiments data for demo
-            mock_experiments = self._get_mock_experiments(experiment_ids)
-            
             # Generate nodes and relationships
-            for exp in mock_experiments:
+            for exp in experiments:
                 exp_node_id = f"exp_{exp['id']}"
+                batch_nodes = []
+                batch_edges = []
                 
                 # Add experiment node
-                if exp_node_id not in node_ids:
-                    nodes.append({
-                        'data': {
-                            'id': exp_node_id,
-                            'label': exp['title'][:30] + "...",
-                            'type': 'experiment',
-                            'size': 25,
-                            'color': '#0B3D91'
-                        }
-                    })
-                    node_ids.add(exp_node_id)
+                self._add_node(batch_nodes, node_ids, exp_node_id, exp['title'][:30] + "...", self._EXPERIMENT_STYLE)
                 
                 # Add organism nodes
                 if exp.get('organism'):
-                    org_id = f"org_{exp['organism'].replace(' ', '_').lower()}"
-                    if org_id not in node_ids:
-                        nodes.append({
-                            'data': {
-                                'id': org_id,
-                                'label': exp['organism'],
-                                'type': 'organism',
-                                'size': 20,
-                                'color': '#EF4444'
-                            }
-                        })
-                        node_ids.add(org_id)
-                    
-                    edges.append({
-                        'data': {
-                            'id': f"{exp_node_id}_{org_id}",
-                            'source': exp_node_id,
-                            'target': org_id,
-                            'label': 'studies',
-                            'type': 'studies'
-                        }
-                    })
+                    org_id = f"org_{exp['organism'].translate(_ID_TRANS).lower()}"
+                    self._add_node(batch_nodes, node_ids, org_id, exp['organism'], self._ORGANISM_STYLE)
+                    self._add_edge(batch_edges, exp_node_id, org_id, 'studies', 'studies')
                 
                 # Add mission nodes
                 if exp.get('mission'):
-                    mission_id = f"mission_{exp['mission'].replace(' ', '_').replace('-', '_').lower()}"
-                    if mission_id not in node_ids:
-                        nodes.append({
-                            'data': {
-                                'id': mission_id,
-                                'label': exp['mission'],
-                                'type': 'mission',
-                                'size': 18,
-                                'color': '#6366F1'
-                            }
-                        })
-                        node_ids.add(mission_id)
-                    
-                    edges.append({
-                        'data': {
-                            'id': f"{exp_node_id}_{mission_id}",
-                            'source': exp_node_id,
-                            'target': mission_id,
-                            'label': 'conducted_in',
-                            'type': 'conducted_in'
-                        }
-                    })
+                    mission_id = f"mission_{exp['mission'].translate(_ID_TRANS).lower()}"
+                    self._add_node(batch_nodes, node_ids, mission_id, exp['mission'], self._MISSION_STYLE)
+                    self._add_edge(batch_edges, exp_node_id, mission_id, 'conducted_in', 'conducted_in')
                 
                 # Add keyword/factor nodes
                 for keyword in exp.get('keywords', [])[:3]:  # Limit to top 3
-                    keyword_id = f"kw_{keyword.replace(' ', '_').lower()}"
-                    if keyword_id not in node_ids:
-                        nodes.append({
-                            'data': {
-                                'id': keyword_id,
-                                'label': keyword,
-                                'type': 'keyword',
-                                'size': 15,
-                                'color': '#10B981'
-                            }
-                        })
-                        node_ids.add(keyword_id)
-                    
-                    edges.append({
-                        'data': {
-                            'id': f"{exp_node_id}_{keyword_id}",
-                            'source': exp_node_id,
-                            'target': keyword_id,
-                            'label': 'involves',
-                            'type': 'involves'
-                        }
-                    })
+                    keyword_id = f"kw_{keyword.translate(_ID_TRANS).lower()}"
+                    self._add_node(batch_nodes, node_ids, keyword_id, keyword, self._KEYWORD_STYLE)
+                    self._add_edge(batch_edges, exp_node_id, keyword_id, 'involves', 'involves')
+                
+                node_rows.extend(batch_nodes)
+                edge_rows.extend(batch_edges)
             
             # Add cross-experiment relationships
-            self._add_cross_relationships(nodes, edges, node_ids)
+            self._add_cross_relationships(node_rows, edge_rows)
             
             return {
-                'nodes': nodes,
-                'edges': edges,
+                'nodes': self._to_elements(self._NODE_FIELDS, node_rows),
+                'edges': self._to_elements(self._EDGE_FIELDS, edge_rows),
                 'layout': {
                     'name': 'cose',
                     'animate': True,
@@ -140,144 +203,75 @@ class KnowledgeGraphGenerator:
             print(f"Error generating knowledge graph: {e}")
             return self._get_fallback_graph()
     
+    def _add_node(self, rows: List[Tuple], node_ids: Set[str],
+                  node_id: str, label: str, style: Tuple[str, int, str]):
+        """Append a node row unless a node with the same id already exists"""
+        if node_id in node_ids:
+            return
+        node_ids.add(node_id)
+        rows.append((node_id, label, *style))
+    
+    def _add_edge(self, rows: List[Tuple], source: str, target: str,
+                  label: str, edge_type: str, style: Optional[str] = None,
+                  edge_id: Optional[str] = None):
+        """Append an edge row"""
+        rows.append((edge_id or f"{source}_{target}", source, target, label, edge_type, style))
+    
+    def _to_elements(self, fields: Tuple[str, ...], rows: List[Tuple]) -> List[Dict]:
+        """Expand tuple rows into Cytoscape elements, skipping unset fields"""
+        return [
+            {'data': {field: value for field, value in zip(fields, row) if value is not None}}
+            for row in rows
+        ]
+    
     def _get_mock_experiments(self, experiment_ids: List[str]) -> List[Dict]:
         """Get mock experiment data for demo"""
-        mock_data = [
-            {
-                'id': 'GLDS-21',
-                'title': 'Spaceflight Effects on Arabidopsis Gene Expression',
-                'organism': 'Arabidopsis thaliana',
-                'mission': 'STS-131',
-                'keywords': ['microgravity', 'gene expression', 'plants', 'spaceflight']
-            },
-            {
-                'id': 'GLDS-47',
-                'title': 'Muscle Atrophy in Microgravity',
-                'organism': 'Mus musculus',
-                'mission': 'Rodent Research-1',
-                'keywords': ['muscle atrophy', 'microgravity', 'protein degradation']
-            },
-            {
-                'id': 'GLDS-173',
-                'title': 'Microbial Communities in Space',
-                'organism': 'Escherichia coli',
-                'mission': 'ISS Expedition-45',
-                'keywords': ['microbiome', 'bacteria', 'space adaptation']
-            },
-            {
-                'id': 'GLDS-242',
-                'title': 'Bone Density Changes in Astronauts',
-                'organism': 'Homo sapiens',
-                'mission': 'ISS Long Duration',
-                'keywords': ['bone density', 'calcium', 'osteoporosis']
-            }
-        ]
-        
         # Filter by requested IDs or return all for demo
         if experiment_ids and experiment_ids != ['']:
-            return [exp for exp in mock_data if exp['id'] in experiment_ids]
+            # Look requested ids up directly, keeping the mock data's order
+            positions = sorted(
+                _MOCK_POSITION_BY_ID[exp_id] for exp_id in set(experiment_ids)
+                if exp_id in _MOCK_POSITION_BY_ID
+            )
+            return [_MOCK_EXPERIMENTS[position] for position in positions]
         
-        return mock_data
+        return _MOCK_EXPERIMENTS
     
-    def _add_cross_relationships(self, nodes: List[Dict], edges: List[Dict], node_ids: Set[str]):
+    def _add_cross_relationships(self, node_rows: List[Tuple], edge_rows: List[Tuple]):
         """Add relationships between similar entities"""
-        # Find organisms that share keywords
-        organism_keywords = defaultdict(set)
-        keyword_organisms = defaultdict(set)
+        node_index = {row[0]: position for position, row in enumerate(node_rows)}
         
-        for node in nodes:
-            if node['data']['type'] == 'organism':
-                org_id = node['data']['id']
-                # Find related keywords through edges
-                for edge in edges:
-                    if edge['data']['source'].startswith('exp_') and edge['data']['target'].startswith('kw_'):
-                        # Find experiments with this organism
-                        for exp_edge in edges:
-                            if exp_edge['data']['target'] == org_id and exp_edge['data']['source'] == edge['data']['source']:
-                                keyword_id = edge['data']['target']
-                                organism_keywords[org_id].add(keyword_id)
-                                keyword_organisms[keyword_id].add(org_id)
+        # Index experiment -> organism and experiment -> keywords in one pass,
+        # working on node rows rather than string ids. Keyword sets are int
+        # bitmasks (bit n = node row n) so overlap tests are a single AND.
+        exp_to_org = {}
+        exp_to_keywords = defaultdict(int)
+
+        for _, source, target, _, edge_type, _ in edge_rows:
+            if edge_type == 'studies':
+                exp_to_org[node_index[source]] = node_index[target]
+            elif edge_type == 'involves':
+                exp_to_keywords[node_index[source]] |= 1 << node_index[target]
+
+        # Find organisms that share keywords
+        organism_keywords = defaultdict(int)
+        for exp_row, keyword_mask in exp_to_keywords.items():
+            org_row = exp_to_org.get(exp_row)
+            if org_row is not None:
+                organism_keywords[org_row] |= keyword_mask
         
         # Add similarity edges between organisms with shared keywords
-        organisms = list(organism_keywords.keys())
-        for i, org1 in enumerate(organisms):
-            for org2 in organisms[i+1:]:
-                shared_keywords = organism_keywords[org1] & organism_keywords[org2]
-                if len(shared_keywords) >= 1:  # At least 1 shared keyword
-                    edges.append({
-                        'data': {
-                            'id': f"similar_{org1}_{org2}",
-                            'source': org1,
-                            'target': org2,
-                            'label': 'similar_to',
-                            'type': 'similarity',
-                            'style': 'dashed'
-                        }
-                    })
+        organisms = list(organism_keywords.items())
+        for i, (org1, keywords1) in enumerate(organisms):
+            for org2, keywords2 in organisms[i+1:]:
+                if keywords1 & keywords2:  # At least 1 shared keyword
+                    source, target = node_rows[org1][0], node_rows[org2][0]
+                    self._add_edge(edge_rows, source, target, 'similar_to', 'similarity',
+                                   style='dashed', edge_id=f"similar_{source}_{target}")
     
     def _get_graph_style(self) -> List[Dict]:
         """Define Cytoscape styling for the graph"""
-        return [
-            {
-                'selector': 'node',
-                'style': {
-                    'background-color': 'data(color)',
-                    'label': 'data(label)',
-                    'width': 'data(size)',
-                    'height': 'data(size)',
-                    'text-valign': 'center',
-                    'text-halign': 'center',
-                    'color': '#ffffff',
-                    'font-size': '10px',
-                    'font-family': 'Inter, sans-serif'
-                }
-            },
-            {
-                'selector': 'node[type="experiment"]',
-                'style': {
-                    'shape': 'rectangle',
-                    'border-width': 2,
-                    'border-color': '#ffffff'
-                }
-            },
-            {
-                'selector': 'node[type="organism"]',
-                'style': {
-                    'shape': 'ellipse'
-                }
-            },
-            {
-                'selector': 'node[type="mission"]',
-                'style': {
-                    'shape': 'diamond'
-                }
-            },
-            {
-                'selector': 'node[type="keyword"]',
-                'style': {
-                    'shape': 'triangle'
-                }
-            },
-            {
-                'selector': 'edge',
-                'style': {
-                    'width': 2,
-                    'line-color': '#6366F1',
-                    'target-arrow-color': '#6366F1',
-                    'target-arrow-shape': 'triangle',
-                    'curve-style': 'bezier',
-                    'opacity': 0.7
-                }
-            },
-            {
-                'selector': 'edge[type="similarity"]',
-                'style': {
-                    'line-style': 'dashed',
-                    'line-color': '#10B981',
-                    'target-arrow-color': '#10B981'
-                }
-            }
-        ]
+        return _GRAPH_STYLE
     
     def _get_fallback_graph(self) -> Dict:
         """Fallback graph when generation fails"""
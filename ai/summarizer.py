@@ -2,35 +2,78 @@
 AI-powered experiment summarization using HuggingFace transformers
 """
 import asyncio
+import time
+import zlib
 from typing import Dict, List, Optional
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-from keybert import KeyBERT
-import torch
 
 class ExperimentSummarizer:
+    # Seconds a cached summary, keyword list or relevance score stays valid
+    CACHE_TTL = 3600
+    # Entries kept per result cache before the oldest are evicted
+    CACHE_SIZE = 16384
+    
     def __init__(self):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        # Resolved when the models load, so importing this module doesn't pull in torch
+        self.device = None
         
         # Initialize BART for summarization
         self.summarizer = None
-        self.keyword_extractor = KeyBERT()
+        
+        # One sentence-transformer shared by keyword extraction and relevance scoring
+        self.st_model = None
+        self.keyword_extractor = None
+        
+        # (experiment id, crc32 of model input) -> (stored at, result); embeddings
+        # are (document embeddings, candidate phrase embeddings)
+        self._embedding_cache = {}
+        self._summary_cache = {}
+        self._keyword_cache = {}
+        # (experiment id, crc32 of model input, normalized query) -> (stored at, score)
+        self._relevance_cache = {}
         
         # Load models lazily
         self._models_loaded = False
+        self._loading = None
     
     async def _load_models(self):
-        """Lazy load AI models to improve startup time"""
+        """Lazy load AI models to improve startup time
+        
+        Loading runs in a worker thread so the event loop keeps serving requests;
+        concurrent callers wait on the same load.
+        """
+        if not self._models_loaded:
+            if self._loading is None:
+                self._loading = asyncio.ensure_future(asyncio.to_thread(self._load_models_blocking))
+            await self._loading
+    
+    def _load_models_blocking(self):
+        """Import and load the models"""
         if not self._models_loaded:
             try:
+                # Heavy ML imports are deferred until summarization is actually needed
+                import torch
+                from transformers import pipeline
+                from keybert import KeyBERT
+                from sentence_transformers import SentenceTransformer
+                
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+                
+                # Half precision halves weight memory and bandwidth on GPU;
+                # CPUs without native bf16/fp16 kernels are faster in fp32
+                torch_dtype = torch.float16 if self.device == "cuda" else torch.float32
+                
                 # Use a smaller, faster model for demo purposes
                 self.summarizer = pipeline(
                     "summarization",
                     model="facebook/bart-large-cnn",
                     device=0 if self.device == "cuda" else -1,
+                    torch_dtype=torch_dtype,
                     max_length=150,
                     min_length=50,
                     do_sample=False
                 )
+                self.st_model = SentenceTransformer('all-MiniLM-L6-v2')
+                self.keyword_extractor = KeyBERT(model=self.st_model)
                 self._models_loaded = True
                 print("✅ AI models loaded successfully")
             except Exception as e:
@@ -38,30 +81,60 @@ class ExperimentSummarizer:
                 # Fallback to mock summaries for demo
                 self._models_loaded = "mock"
     
+    async def get_sentence_encoder(self):
+        """The loaded SentenceTransformer, or None when running on mock output"""
+        await self._load_models()
+        return self.st_model if self._models_loaded is True else None
+    
     async def generate_summary(self, experiment: Dict) -> str:
         """Generate AI summary for an experiment"""
+        summaries = await self.generate_summaries([experiment])
+        return summaries[0]
+    
+    async def generate_summaries(self, experiments: List[Dict], batch_size: int = 8) -> List[str]:
+        """Generate AI summaries for several experiments with one batched pipeline call"""
         await self._load_models()
         
+        if not experiments:
+            return []
+        
         try:
+            if self._models_loaded == "mock":
+                return [self._generate_mock_summary(experiment) for experiment in experiments]
+            
             # Combine experiment metadata for summarization
-            text_to_summarize = self._prepare_text_for_summary(experiment)
+            texts_to_summarize = [self._prepare_text_for_summary(experiment) for experiment in experiments]
+            cache_keys = [
+                self._cache_key(experiment, text)
+                for experiment, text in zip(experiments, texts_to_summarize)
+            ]
             
-            if self._models_loaded == "mock":
-                return self._generate_mock_summary(experiment)
+            # Serve repeat experiments from cache and only run the model on the rest
+            summaries = [self._cache_get(self._summary_cache, key) for key in cache_keys]
+            missing = [i for i, summary in enumerate(summaries) if summary is None]
             
-            # Generate summary using BART
-            summary = self.summarizer(
-                text_to_summarize,
-                max_length=130,
-                min_length=30,
-                do_sample=False
-            )[0]['summary_text']
+            if missing:
+                # Generate summaries using BART, letting the pipeline batch the forward passes;
+                # inference runs in a worker thread so it doesn't block the event loop
+                outputs = await asyncio.to_thread(
+                    self.summarizer,
+                    [texts_to_summarize[i] for i in missing],
+                    max_length=130,
+                    min_length=30,
+                    do_sample=False,
+                    batch_size=batch_size,
+                    truncation=True
+                )
+                
+                for i, output in zip(missing, outputs):
+                    summaries[i] = output['summary_text']
+                    self._cache_set(self._summary_cache, cache_keys[i], summaries[i])
             
-            return summary
+            return summaries
             
         except Exception as e:
-            print(f"Error generating summary: {e}")
-            return self._generate_mock_summary(experiment)
+            print(f"Error generating summaries: {e}")
+            return [self._generate_mock_summary(experiment) for experiment in experiments]
     
     async def extract_keywords(self, experiment: Dict) -> List[str]:
         """Extract key terms from experiment using KeyBERT"""
@@ -69,33 +142,129 @@ class ExperimentSummarizer:
         
         try:
             text = self._prepare_text_for_keywords(experiment)
+            cache_key = self._cache_key(experiment, text)
+            
+            cached = self._cache_get(self._keyword_cache, cache_key)
+            if cached is not None:
+                return cached
             
-            # Extract keywords
-            keywords = self.keyword_extractor.extract_keywords(
+            doc_embeddings, word_embeddings = await asyncio.to_thread(self._get_embeddings, experiment, text)
+            
+            # Extract keywords, reusing cached embeddings instead of re-encoding the text
+            keywords = (await asyncio.to_thread(
+                self.keyword_extractor.extract_keywords,
                 text,
                 keyphrase_ngram_range=(1, 2),
-                stop_words='english'
-            )[:8]  # Take top 8 keywords
+                stop_words='english',
+                doc_embeddings=doc_embeddings,
+                word_embeddings=word_embeddings
+            ))[:8]  # Take top 8 keywords
             
-            return [kw[0] for kw in keywords]
+            keywords = [kw[0] for kw in keywords]
+            self._cache_set(self._keyword_cache, cache_key, keywords)
+            return keywords
             
         except Exception as e:
             print(f"Error extracting keywords: {e}")
             return self._generate_mock_keywords(experiment)
     
+    async def summarize_and_extract(self, experiment: Dict) -> Dict:
+        """Generate summary and keywords for an experiment concurrently"""
+        summary, keywords = await asyncio.gather(
+            self.generate_summary(experiment),
+            self.extract_keywords(experiment)
+        )
+        return {'summary': summary, 'keywords': keywords}
+    
+    async def process_many(self, experiments: List[Dict], concurrency: int = 8) -> List[Dict]:
+        """Summarize and extract keywords for many experiments, bounding in-flight model calls"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def process(experiment: Dict) -> Dict:
+            async with semaphore:
+                return await self.summarize_and_extract(experiment)
+        
+        return await asyncio.gather(*(process(experiment) for experiment in experiments))
+    
     async def calculate_relevance(self, query: str, experiment: Dict) -> float:
         """Calculate relevance score between query and experiment"""
-        # Simple relevance scoring for demo
-        # In production, use sentence transformers for semantic similarity
+        await self._load_models()
+        
+        text = self._prepare_text_for_keywords(experiment)
+        
+        # Scores depend only on the experiment and the normalized query, so
+        # repeated searches reuse them
+        query = " ".join(query.lower().split())
+        cache_key = self._cache_key(experiment, text) + (query,)
+        cached = self._cache_get(self._relevance_cache, cache_key)
+        if cached is not None:
+            return cached
+        
+        if self._models_loaded == "mock":
+            score = self._score_relevance(query, experiment, text)
+        else:
+            # Model inference runs in a worker thread so it doesn't block the event loop
+            score = await asyncio.to_thread(self._score_relevance, query, experiment, text)
+        self._cache_set(self._relevance_cache, cache_key, score)
+        return score
+    
+    def _score_relevance(self, query: str, experiment: Dict, text: str) -> float:
+        """Relevance of an experiment's text to a normalized query"""
+        if self._models_loaded != "mock":
+            try:
+                from sentence_transformers import util
+                
+                # Semantic similarity between the query and the cached document embedding
+                doc_embeddings, _ = self._get_embeddings(experiment, text)
+                query_embedding = self.st_model.encode(query)
+                score = float(util.cos_sim(query_embedding, doc_embeddings)[0][0])
+                return min(max(score, 0.0), 1.0)
+                
+            except Exception as e:
+                print(f"Error calculating relevance: {e}")
         
-        text = self._prepare_text_for_keywords(experiment).lower()
+        # Fall back to simple term matching
+        text_lower = text.lower()
         query_terms = query.lower().split()
         
-        matches = sum(1 for term in query_terms if term in text)
+        matches = sum(1 for term in query_terms if term in text_lower)
         score = matches / len(query_terms) if query_terms else 0
         
         return min(score, 1.0)
     
+    def _get_embeddings(self, experiment: Dict, text: str):
+        """Get document and candidate phrase embeddings for an experiment's text, cached"""
+        cache_key = self._cache_key(experiment, text)
+        embeddings = self._cache_get(self._embedding_cache, cache_key)
+        
+        if embeddings is None:
+            embeddings = self.keyword_extractor.extract_embeddings(
+                text,
+                keyphrase_ngram_range=(1, 2),
+                stop_words='english'
+            )
+            self._cache_set(self._embedding_cache, cache_key, embeddings)
+        
+        return embeddings
+    
+    def _cache_key(self, experiment: Dict, text: str) -> tuple:
+        """Cache key for a model result: experiment id plus a hash of the model input"""
+        return (experiment.get('id'), zlib.crc32(text.encode()))
+    
+    def _cache_get(self, cache: Dict, key: tuple):
+        """Return a cached result if it hasn't expired, else None"""
+        entry = cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.CACHE_TTL:
+            return entry[1]
+        return None
+    
+    def _cache_set(self, cache: Dict, key: tuple, value):
+        """Store a result with the current time, evicting the oldest entry when full"""
+        cache.pop(key, None)
+        if len(cache) >= self.CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = (time.monotonic(), value)
+    
     def _prepare_text_for_summary(self, experiment: Dict) -> str:
         """Prepare experiment text for summarization"""
         parts = []
@@ -115,10 +284,18 @@ class ExperimentSummarizer:
         if experiment.get('factors'):
             parts.append(f"Factors: {', '.join(experiment['factors'])}")
         
-        text = ". ".join(parts)
+        # Truncate if too long for model, stopping at the first part that
+        # crosses the limit instead of joining text that gets sliced away
+        limit = 1024
+        kept = []
+        length = -2  # no separator before the first part
+        for part in parts:
+            kept.append(part)
+            length += len(part) + 2
+            if length >= limit:
+                break
         
-        # Truncate if too long for model
-        return text[:1024] if len(text) > 1024 else text
+        return ". ".join(kept)[:limit]
     
     def _prepare_text_for_keywords(self, experiment: Dict) -> str:
         """Prepare experiment text for keyword extraction"""
@@ -142,8 +319,9 @@ class ExperimentSummarizer:
             f"Investigation of molecular and cellular changes in {organism} under spaceflight conditions."
         ]
         
-        # Simple hash-based selection for consistency
-        hash_val = hash(experiment.get('id', 'default')) % len(summaries)
+        # Stable hash-based selection so every process picks the same summary
+        # (built-in hash() of a str is randomized per process)
+        hash_val = zlib.crc32(experiment.get('id', 'default').encode()) % len(summaries)
         return summaries[hash_val]
     
     def _generate_mock_keywords(self, experiment: Dict) -> List[str]:
@@ -0,0 +1,180 @@
+"""
+Mock experiments and knowledge graph served when NASA OSDR is unavailable
+
+Imported lazily by index.py so cold starts that reach OSDR never build these.
+"""
+import hashlib
+from bisect import bisect_right
+import orjson
+from collections import defaultdict
+from functools import reduce
+from typing import List, Dict, Any
+
+# Mock data for experiments (optimized for serverless)
+mock_experiments = [
+    {
+        "id": "GLDS-21",
+        "title": "Spaceflight Effects on Arabidopsis Gene Expression",
+        "summary": "Investigation of how microgravity affects plant gene expression patterns in Arabidopsis thaliana during spaceflight missions.",
+        "organism": "Arabidopsis thaliana",
+        "mission": "STS-131",
+        "keywords": ["microgravity", "gene expression", "plants", "spaceflight"],
+        "dataTypes": ["RNA-Seq", "Microarray"],
+        "publicationCount": 12,
+        "duration": "14 days"
+    },
+    {
+        "id": "GLDS-47",
+        "title": "Muscle Atrophy in Microgravity",
+        "summary": "Study of muscle protein degradation pathways in mouse models under simulated microgravity conditions.",
+        "organism": "Mus musculus",
+        "mission": "Rodent Research-1",
+        "keywords": ["muscle atrophy", "microgravity", "protein degradation", "mice"],
+        "dataTypes": ["Proteomics", "Histology"],
+        "publicationCount": 8,
+        "duration": "30 days"
+    },
+    {
+        "id": "GLDS-104",
+        "title": "Cardiac Function in Space",
+        "summary": "Analysis of cardiovascular adaptations and cardiac muscle changes during long-duration spaceflight.",
+        "organism": "Homo sapiens",
+        "mission": "ISS Expedition 42",
+        "keywords": ["cardiac", "cardiovascular", "spaceflight", "adaptation"],
+        "dataTypes": ["Echocardiography", "Blood Analysis"],
+        "publicationCount": 15,
+        "duration": "180 days"
+    },
+    {
+        "id": "GLDS-78",
+        "title": "Bone Density Loss Studies",
+        "summary": "Investigation of bone mineral density changes and osteoblast activity in microgravity environments.",
+        "organism": "Rattus norvegicus",
+        "mission": "SpaceX CRS-12",
+        "keywords": ["bone density", "osteoblast", "calcium", "microgravity"],
+        "dataTypes": ["X-ray", "Biochemistry"],
+        "publicationCount": 6,
+        "duration": "60 days"
+    },
+    {
+        "id": "GLDS-173",
+        "title": "Neural Development in Microgravity",
+        "summary": "Study of neural stem cell differentiation and brain development under microgravity conditions.",
+        "organism": "Homo sapiens",
+        "mission": "ISS Expedition 56",
+        "keywords": ["neural", "stem cells", "brain", "development"],
+        "dataTypes": ["Single-cell RNA-Seq", "Imaging"],
+        "publicationCount": 9,
+        "duration": "21 days"
+    }
+]
+
+def _mock_search_fields(exp: Dict[str, Any]) -> List[str]:
+    """Fields of a mock experiment that the search endpoint matches against"""
+    return [exp["title"], exp["organism"], exp["summary"], *exp["keywords"]]
+
+def _trigrams(text: str) -> set:
+    """Overlapping 3-character slices of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# Inverted index of lowercase character trigrams -> positions in mock_experiments.
+# Trigrams (rather than whole words) keep substring queries such as "micro" working:
+# any field containing the query contains all of the query's trigrams.
+mock_search_index = defaultdict(set)
+for _position, _exp in enumerate(mock_experiments):
+    for _field in _mock_search_fields(_exp):
+        for _gram in _trigrams(_field.lower()):
+            mock_search_index[_gram].add(_position)
+
+# Lowercased, UTF-8 encoded searchable text per mock experiment, fields separated
+# by NUL so a query can't match across a field boundary. Matching on bytes uses
+# CPython's memchr-based fast search; UTF-8 keeps substring semantics intact.
+mock_search_blobs = [
+    "\0".join(_mock_search_fields(exp)).lower().encode("utf-8") for exp in mock_experiments
+]
+
+# All blobs concatenated into one buffer, with the start offset of each blob (plus
+# the end of the buffer), for queries the trigram index can't narrow down
+mock_search_buffer = b"".join(mock_search_blobs)
+mock_search_offsets = [0]
+for _blob in mock_search_blobs:
+    mock_search_offsets.append(mock_search_offsets[-1] + len(_blob))
+
+def _scan_mock_search_buffer(needle: bytes) -> List[int]:
+    """Positions of the blobs containing needle, found with find() over the whole buffer
+    
+    A hit is mapped back to its blob by bisecting the offsets; one that runs past the
+    end of its blob spans two records and is skipped. After a match the scan resumes
+    at the next blob.
+    """
+    matches = []
+    start = 0
+    while True:
+        pos = mock_search_buffer.find(needle, start)
+        if pos == -1:
+            return matches
+        i = bisect_right(mock_search_offsets, pos) - 1
+        if i >= len(mock_search_blobs):
+            return matches
+        if pos + len(needle) <= mock_search_offsets[i + 1]:
+            matches.append(i)
+            start = mock_search_offsets[i + 1]
+        else:
+            start = pos + 1
+
+def search_mock_experiments(query: str) -> List[Dict[str, Any]]:
+    """Substring search over mock_experiments, narrowed by the trigram index"""
+    query_lower = query.lower()
+    needle = query_lower.encode("utf-8")
+    query_grams = _trigrams(query_lower)
+    if not query_grams:
+        # Queries shorter than 3 characters can't use the index
+        return [mock_experiments[i] for i in _scan_mock_search_buffer(needle)]
+    
+    candidates = sorted(reduce(
+        set.intersection,
+        (mock_search_index.get(gram, set()) for gram in query_grams)
+    ))
+    return [mock_experiments[i] for i in candidates if needle in mock_search_blobs[i]]
+
+# Mock knowledge graph data
+mock_graph_data = {
+    "nodes": [
+        {"data": {"id": "microgravity", "label": "Microgravity", "type": "condition"}},
+        {"data": {"id": "gene-expression", "label": "Gene Expression", "type": "process"}},
+        {"data": {"id": "muscle-atrophy", "label": "Muscle Atrophy", "type": "outcome"}},
+        {"data": {"id": "bone-loss", "label": "Bone Loss", "type": "outcome"}},
+        {"data": {"id": "neural-changes", "label": "Neural Changes", "type": "outcome"}},
+        {"data": {"id": "arabidopsis", "label": "Arabidopsis", "type": "organism"}},
+        {"data": {"id": "mouse", "label": "Mouse", "type": "organism"}},
+        {"data": {"id": "human", "label": "Human", "type": "organism"}},
+        {"data": {"id": "spaceflight", "label": "Spaceflight", "type": "condition"}},
+        {"data": {"id": "adaptation", "label": "Adaptation", "type": "process"}}
+    ],
+    "edges": [
+        {"data": {"source": "microgravity", "target": "gene-expression", "label": "affects"}},
+        {"data": {"source": "microgravity", "target": "muscle-atrophy", "label": "causes"}},
+        {"data": {"source": "microgravity", "target": "bone-loss", "label": "induces"}},
+        {"data": {"source": "spaceflight", "target": "adaptation", "label": "triggers"}},
+        {"data": {"source": "gene-expression", "target": "arabidopsis", "label": "studied in"}},
+        {"data": {"source": "muscle-atrophy", "target": "mouse", "label": "observed in"}},
+        {"data": {"source": "bone-loss", "target": "human", "label": "measured in"}},
+        {"data": {"source": "neural-changes", "target": "human", "label": "detected in"}}
+    ]
+}
+
+# Static payloads are encoded once at import instead of on every request
+mock_graph_json = orjson.dumps(mock_graph_data)
+mock_graph_etag = f'"{hashlib.md5(mock_graph_json).hexdigest()}"'
+mock_experiments_json = orjson.dumps(
+    {"experiments": mock_experiments, "dataSource": "Mock Data", "isRealData": False}
+)
+mock_experiments_error_json = orjson.dumps(
+    {"experiments": mock_experiments, "dataSource": "Mock Data (API Error)", "isRealData": False}
+)
+mock_results_json = orjson.dumps(
+    {"results": mock_experiments, "dataSource": "Mock Data", "isRealData": False}
+)
+mock_results_error_json = orjson.dumps(
+    {"results": mock_experiments, "dataSource": "Mock Data (API Error)", "isRealData": False}
+)
@@ -1,66 +1,221 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 import os
 import json
 import sys
 import asyncio
-import aiohttp
-from typing import List, Dict, Any, Optional
+import hashlib
+import httpx
+import ijson
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+import re
+import time
+import orjson
+from functools import wraps
+from pathlib import Path
+
+# Make sibling modules (the lazily loaded mock data) importable
+sys.path.insert(0, str(Path(__file__).parent))
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def async_ttl_cache(maxsize: int, ttl: float):
+    """Cache non-empty results of an async function per argument tuple for ttl seconds
+    
+    Empty results are what the OSDR helpers return on failure, so they are never
+    cached and the next call retries upstream.
+    """
+    def decorator(func):
+        cache: Dict[tuple, tuple] = {}  # key -> (stored at, result)
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            entry = cache.get(key)
+            if entry and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+            
+            result = await func(*args, **kwargs)
+            if result:
+                cache.pop(key, None)
+                if len(cache) >= maxsize:
+                    # Evict the oldest entry
+                    cache.pop(next(iter(cache)))
+                cache[key] = (time.monotonic(), result)
+            return result
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+def single_flight(func):
+    """Share one in-flight call between concurrent callers with the same arguments"""
+    inflight: Dict[tuple, asyncio.Future] = {}
+    
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # Shielded so one caller going away doesn't cancel the request for the others
+        return await asyncio.shield(task)
+    
+    return wrapper
+
+def compile_keyword_matcher(keywords: Tuple[str, ...]):
+    """Build a function returning, in table order, the keywords that occur in a text
+    
+    All keywords are found in one C-level regex scan. The lookahead lets matches
+    overlap; alternatives are tried longest first, so a keyword nested at the
+    start of a longer one ('space' in 'spaceflight') is recovered from the
+    implied table.
+    """
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    pattern = re.compile(f"(?=({alternation}))")
+    implied = {k: frozenset(other for other in keywords if other in k) for k in keywords}
+    
+    def match(text: str) -> List[str]:
+        found = set()
+        for hit in set(pattern.findall(text)):
+            found |= implied[hit]
+        return [k for k in keywords if k in found]
+    
+    return match
+
+# Space-related keywords tagged on experiments whose title or description mention them
+OSDR_SPACE_KEYWORDS = ('microgravity', 'spaceflight', 'space', 'ISS', 'bone',
+                       'muscle', 'cardiovascular', 'radiation', 'gene expression',
+                       'inflammation', 'immune')
+LEGACY_SPACE_KEYWORDS = ('microgravity', 'spaceflight', 'space', 'ISS', 'gene expression',
+                         'muscle atrophy', 'bone density', 'cardiovascular', 'radiation',
+                         'plant growth', 'development', 'immune system')
+match_osdr_space_keywords = compile_keyword_matcher(OSDR_SPACE_KEYWORDS)
+match_legacy_space_keywords = compile_keyword_matcher(LEGACY_SPACE_KEYWORDS)
+
+# Output key -> OSDR source field for study fields copied as-is ('' when missing)
+OSDR_PASSTHROUGH_FIELDS = (
+    ('releaseDate', 'Study Public Release Date'),
+    ('projectType', 'Project Type'),
+    ('flightProgram', 'Flight Program'),
+    ('spaceProgram', 'Space Program'),
+    ('managingCenter', 'Managing NASA Center'),
+)
+
+class CircuitBreaker:
+    """Stop calling an upstream for a cool-down period after repeated failures"""
+    
+    def __init__(self, failure_threshold: int = 3, reset_after: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.open_until = 0.0
+    
+    def allow(self) -> bool:
+        """Whether a request may be attempted now"""
+        return time.monotonic() >= self.open_until
+    
+    def record_success(self):
+        self.failures = 0
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            # Open the circuit. After the cool-down it is half-open: requests probe
+            # upstream again, and a single failed probe reopens it straight away
+            self.open_until = time.monotonic() + self.reset_after
+            self.failures = self.failure_threshold - 1
+
 # NASA OSDR API Integration
+osdr_circuit = CircuitBreaker()
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared OSDR client, creating it on first use"""
+    client = getattr(app.state, 'http', None)
+    if client is None or client.is_closed:
+        # One long-lived HTTP/2 client multiplexes concurrent requests to osdr.nasa.gov
+        # over a kept-alive connection
+        client = httpx.AsyncClient(
+            http2=True,
+            # Fail fast: the mock fallback is instant, so a slow OSDR shouldn't hold requests
+            timeout=httpx.Timeout(3.0, connect=0.5, read=2.0),
+            # Idle connections are kept for 75s (httpx defaults to 5s) so requests a little
+            # apart still skip DNS resolution and the TLS handshake
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=75)
+        )
+        app.state.http = client
+    return client
+
+async def read_osdr_hits(response: httpx.Response, limit: int) -> List[Dict[str, Any]]:
+    """Stream-parse up to limit study hits (hits.hits[]) from an OSDR search response
+    
+    Hits are decoded as the body arrives and reading stops once limit hits are
+    in hand, so the full response is never buffered or parsed as a whole.
+    """
+    study_hits = []
+    parsed = ijson.sendable_list()
+    parser = ijson.items_coro(parsed, 'hits.hits.item', use_float=True)
+    
+    async for chunk in response.aiter_bytes():
+        parser.send(chunk)
+        study_hits.extend(parsed)
+        del parsed[:]
+        if len(study_hits) >= limit:
+            break
+    else:
+        parser.close()
+        study_hits.extend(parsed)
+    
+    return study_hits[:limit]
+
+@async_ttl_cache(maxsize=32, ttl=300)
+@single_flight
 async def fetch_nasa_experiments(limit: int = 15) -> List[Dict[str, Any]]:
     """Fetch experiments from NASA OSDR API"""
+    if not osdr_circuit.allow():
+        # OSDR failed repeatedly just now; let the caller fall back straight away
+        return []
+    
     try:
         search_url = "https://osdr.nasa.gov/osdr/data/search"
         
-        async with aiohttp.ClientSession() as session:
-            search_params = {
-                'q': '*',  # Get all results, simpler and more reliable
-                'size': limit,
-                'from': 0
-            }
-            
-            async with session.get(search_url, params=search_params, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Handle OSDR API response format
-                    hits_data = data.get('hits', {})
-                    if isinstance(hits_data, dict):
-                        total_hits = hits_data.get('total', {})
-                        if isinstance(total_hits, dict):
-                            total_count = total_hits.get('value', 0)
-                        else:
-                            total_count = total_hits
-                        
-                        study_hits = hits_data.get('hits', [])
-                    else:
-                        total_count = 0
-                        study_hits = []
-                    
-                    if total_count == 0 or not study_hits:
-                        logger.info("No studies found in OSDR API")
-                        return []
-                    
-                    experiments = []
-                    for hit in study_hits[:limit]:
-                        experiment = format_nasa_experiment_osdr(hit)
-                        if experiment:
-                            experiments.append(experiment)
-                    
-                    logger.info(f"Successfully fetched {len(experiments)} experiments from NASA OSDR")
-                    return experiments
-                else:
-                    logger.error(f"NASA API request failed with status: {response.status}")
+        client = get_http_client()
+        search_params = {
+            'q': '*',  # Get all results, simpler and more reliable
+            'size': limit,
+            'from': 0
+        }
+        
+        async with client.stream('GET', search_url, params=search_params) as response:
+            if response.status_code == 200:
+                osdr_circuit.record_success()
+                
+                # Handle OSDR API response format
+                study_hits = await read_osdr_hits(response, limit)
+                
+                if not study_hits:
+                    logger.info("No studies found in OSDR API")
                     return []
-                    
+                
+                # Format off the event loop so other requests keep being served
+                experiments = await asyncio.to_thread(format_osdr_hits, study_hits)
+                
+                logger.info(f"Successfully fetched {len(experiments)} experiments from NASA OSDR")
+                return experiments
+            else:
+                osdr_circuit.record_failure()
+                logger.error(f"NASA API request failed with status: {response.status_code}")
+                return []
+            
     except Exception as e:
+        osdr_circuit.record_failure()
         logger.error(f"Error fetching NASA GeneLab data: {str(e)}")
         return []
 
@@ -89,16 +244,12 @@ def format_nasa_experiment_osdr(hit: Dict) -> Optional[Dict[str, Any]]:
             keywords.append(assay_type.lower())
         
         # Add space-related keywords based on content
-        title = source.get('Study Title', '').lower()
-        description = source.get('Study Description', '').lower()
+        # Title and description are scanned as one NUL-separated string
+        title = source.get('Study Title', '')
+        description = source.get('Study Description', '')
+        text = f"{title}\0{description}".lower()
         
-        space_keywords = ['microgravity', 'spaceflight', 'space', 'ISS', 'bone', 
-                         'muscle', 'cardiovascular', 'radiation', 'gene expression',
-                         'inflammation', 'immune']
-        
-        for keyword in space_keywords:
-            if keyword in title or keyword in description:
-                keywords.append(keyword)
+        keywords.extend(match_osdr_space_keywords(text))
         
         # Extract data types
         data_types = []
@@ -114,7 +265,7 @@ def format_nasa_experiment_osdr(hit: Dict) -> Optional[Dict[str, Any]]:
             data_types.append(measurement_type)
         
         # Truncate description
-        description_text = source.get('Study Description', '')
+        description_text = description
         if len(description_text) > 400:
             description_text = description_text[:400] + '...'
         
@@ -124,25 +275,33 @@ def format_nasa_experiment_osdr(hit: Dict) -> Optional[Dict[str, Any]]:
             'summary': description_text,
             'organism': source.get('organism', 'Unknown organism'),
             'mission': mission_name,
-            'keywords': list(set([k for k in keywords if k]))[:8],  # Remove empty and limit
-            'dataTypes': list(set([dt for dt in data_types if dt]))[:5],  # Remove empty and limit
+            'keywords': list(dict.fromkeys(k for k in keywords if k))[:8],  # Remove empty, dedupe in order and limit
+            'dataTypes': list(dict.fromkeys(dt for dt in data_types if dt))[:5],  # Remove empty, dedupe in order and limit
             'publicationCount': 0,  # Would need separate API call to get this
             'duration': 'Variable',
             'submissionDate': '',
-            'releaseDate': source.get('Study Public Release Date', ''),
-            'projectType': source.get('Project Type', ''),
-            'flightProgram': source.get('Flight Program', ''),
-            'spaceProgram': source.get('Space Program', ''),
-            'managingCenter': source.get('Managing NASA Center', ''),
-            'assayTechnology': assay_type
         }
         
+        # Copy OSDR fields that pass through unchanged
+        for key, field in OSDR_PASSTHROUGH_FIELDS:
+            experiment[key] = source.get(field, '')
+        experiment['assayTechnology'] = assay_type
+        
         return experiment
         
     except Exception as e:
         logger.error(f"Error formatting OSDR experiment: {str(e)}")
         return None
 
+def format_osdr_hits(study_hits: List[Dict]) -> List[Dict[str, Any]]:
+    """Format a batch of OSDR hits, dropping any that fail to format"""
+    experiments = []
+    for hit in study_hits:
+        experiment = format_nasa_experiment_osdr(hit)
+        if experiment:
+            experiments.append(experiment)
+    return experiments
+
 def format_nasa_experiment(study: Dict) -> Optional[Dict[str, Any]]:
     """Format NASA study data for our application (legacy fallback)"""
     try:
@@ -162,16 +321,9 @@ def format_nasa_experiment(study: Dict) -> Optional[Dict[str, Any]]:
         
         # Extract keywords from various fields
         keywords = []
-        title_lower = study.get('title', '').lower()
-        desc_lower = study.get('description', '').lower()
+        text = f"{study.get('title', '')}\0{study.get('description', '')}".lower()
         
-        space_keywords = ['microgravity', 'spaceflight', 'space', 'ISS', 'gene expression', 
-                         'muscle atrophy', 'bone density', 'cardiovascular', 'radiation',
-                         'plant growth', 'development', 'immune system']
-        
-        for keyword in space_keywords:
-            if keyword in title_lower or keyword in desc_lower:
-                keywords.append(keyword)
+        keywords.extend(match_legacy_space_keywords(text))
         
         # Extract data types
         data_types = []
@@ -189,7 +341,7 @@ def format_nasa_experiment(study: Dict) -> Optional[Dict[str, Any]]:
             'organism': organism,
             'mission': mission,
             'keywords': keywords[:8],  # Limit keywords
-            'dataTypes': list(set(data_types))[:5],  # Limit and dedupe data types
+            'dataTypes': list(dict.fromkeys(data_types))[:5],  # Limit and dedupe data types, keeping order
             'publicationCount': len(study.get('publications', [])),
             'duration': 'Variable',
             'submissionDate': study.get('submissionDate', ''),
@@ -204,177 +356,156 @@ def format_nasa_experiment(study: Dict) -> Optional[Dict[str, Any]]:
         logger.error(f"Error formatting experiment: {str(e)}")
         return None
 
+@async_ttl_cache(maxsize=256, ttl=300)
+@single_flight
 async def search_nasa_experiments(query: str, limit: int = 10) -> List[Dict[str, Any]]:
     """Search NASA OSDR experiments by query"""
+    if not osdr_circuit.allow():
+        # OSDR failed repeatedly just now; let the caller fall back straight away
+        return []
+    
     try:
         search_url = "https://osdr.nasa.gov/osdr/data/search"
         
-        async with aiohttp.ClientSession() as session:
-            search_params = {
-                'q': query,
-                'size': limit,
-                'from': 0
-            }
-            
-            async with session.get(search_url, params=search_params, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Handle OSDR API response format
-                    hits_data = data.get('hits', {})
-                    if isinstance(hits_data, dict):
-                        total_hits = hits_data.get('total', {})
-                        if isinstance(total_hits, dict):
-                            total_count = total_hits.get('value', 0)
-                        else:
-                            total_count = total_hits
-                        
-                        study_hits = hits_data.get('hits', [])
-                    else:
-                        total_count = 0
-                        study_hits = []
-                    
-                    if total_count == 0 or not study_hits:
-                        return []
-                    
-                    experiments = []
-                    for hit in study_hits:
-                        experiment = format_nasa_experiment_osdr(hit)
-                        if experiment:
-                            experiments.append(experiment)
-                    
-                    return experiments
-                else:
+        client = get_http_client()
+        search_params = {
+            'q': query,
+            'size': limit,
+            'from': 0
+        }
+        
+        async with client.stream('GET', search_url, params=search_params) as response:
+            if response.status_code == 200:
+                osdr_circuit.record_success()
+                
+                # Handle OSDR API response format
+                study_hits = await read_osdr_hits(response, limit)
+                
+                if not study_hits:
                     return []
-                    
+                
+                # Format off the event loop so other requests keep being served
+                experiments = await asyncio.to_thread(format_osdr_hits, study_hits)
+                
+                return experiments
+            else:
+                osdr_circuit.record_failure()
+                return []
+            
     except Exception as e:
+        osdr_circuit.record_failure()
         logger.error(f"Error searching NASA experiments: {str(e)}")
         return []
 
+# Use libuv's event loop when available; it cuts per-callback overhead for socket I/O
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 # Create FastAPI app for serverless deployment
 app = FastAPI(
     title="NULLspace API",
     description="NASA Bioscience Data Explorer API",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
+)
+
+@app.on_event("startup")
+async def open_http_client():
+    get_http_client()
+
+@app.on_event("shutdown")
+async def close_http_client():
+    client = getattr(app.state, 'http', None)
+    if client is not None:
+        await client.aclose()
+
+# Frontend origins allowed to call the API; override with a comma-separated ALLOWED_ORIGINS
+ALLOWED_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.environ.get("ALLOWED_ORIGINS", "https://nullspace.app,http://localhost:3000").split(",")
+    if origin.strip()
 )
 
 # Configure CORS for Vercel deployment
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with your domain
+    allow_origins=list(ALLOWED_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
-# Mock data for experiments (optimized for serverless)
-mock_experiments = [
-    {
-        "id": "GLDS-21",
-        "title": "Spaceflight Effects on Arabidopsis Gene Expression",
-        "summary": "Investigation of how microgravity affects plant gene expression patterns in Arabidopsis thaliana during spaceflight missions.",
-        "organism": "Arabidopsis thaliana",
-        "mission": "STS-131",
-        "keywords": ["microgravity", "gene expression", "plants", "spaceflight"],
-        "dataTypes": ["RNA-Seq", "Microarray"],
-        "publicationCount": 12,
-        "duration": "14 days"
-    },
-    {
-        "id": "GLDS-47",
-        "title": "Muscle Atrophy in Microgravity",
-        "summary": "Study of muscle protein degradation pathways in mouse models under simulated microgravity conditions.",
-        "organism": "Mus musculus",
-        "mission": "Rodent Research-1",
-        "keywords": ["muscle atrophy", "microgravity", "protein degradation", "mice"],
-        "dataTypes": ["Proteomics", "Histology"],
-        "publicationCount": 8,
-        "duration": "30 days"
-    },
-    {
-        "id": "GLDS-104",
-        "title": "Cardiac Function in Space",
-        "summary": "Analysis of cardiovascular adaptations and cardiac muscle changes during long-duration spaceflight.",
-        "organism": "Homo sapiens",
-        "mission": "ISS Expedition 42",
-        "keywords": ["cardiac", "cardiovascular", "spaceflight", "adaptation"],
-        "dataTypes": ["Echocardiography", "Blood Analysis"],
-        "publicationCount": 15,
-        "duration": "180 days"
-    },
-    {
-        "id": "GLDS-78",
-        "title": "Bone Density Loss Studies",
-        "summary": "Investigation of bone mineral density changes and osteoblast activity in microgravity environments.",
-        "organism": "Rattus norvegicus",
-        "mission": "SpaceX CRS-12",
-        "keywords": ["bone density", "osteoblast", "calcium", "microgravity"],
-        "dataTypes": ["X-ray", "Biochemistry"],
-        "publicationCount": 6,
-        "duration": "60 days"
-    },
-    {
-        "id": "GLDS-173",
-        "title": "Neural Development in Microgravity",
-        "summary": "Study of neural stem cell differentiation and brain development under microgravity conditions.",
-        "organism": "Homo sapiens",
-        "mission": "ISS Expedition 56",
-        "keywords": ["neural", "stem cells", "brain", "development"],
-        "dataTypes": ["Single-cell RNA-Seq", "Imaging"],
-        "publicationCount": 9,
-        "duration": "21 days"
-    }
-]
-
-# Mock knowledge graph data
-mock_graph_data = {
-    "nodes": [
-        {"data": {"id": "microgravity", "label": "Microgravity", "type": "condition"}},
-        {"data": {"id": "gene-expression", "label": "Gene Expression", "type": "process"}},
-        {"data": {"id": "muscle-atrophy", "label": "Muscle Atrophy", "type": "outcome"}},
-        {"data": {"id": "bone-loss", "label": "Bone Loss", "type": "outcome"}},
-        {"data": {"id": "neural-changes", "label": "Neural Changes", "type": "outcome"}},
-        {"data": {"id": "arabidopsis", "label": "Arabidopsis", "type": "organism"}},
-        {"data": {"id": "mouse", "label": "Mouse", "type": "organism"}},
-        {"data": {"id": "human", "label": "Human", "type": "organism"}},
-        {"data": {"id": "spaceflight", "label": "Spaceflight", "type": "condition"}},
-        {"data": {"id": "adaptation", "label": "Adaptation", "type": "process"}}
-    ],
-    "edges": [
-        {"data": {"source": "microgravity", "target": "gene-expression", "label": "affects"}},
-        {"data": {"source": "microgravity", "target": "muscle-atrophy", "label": "causes"}},
-        {"data": {"source": "microgravity", "target": "bone-loss", "label": "induces"}},
-        {"data": {"source": "spaceflight", "target": "adaptation", "label": "triggers"}},
-        {"data": {"source": "gene-expression", "target": "arabidopsis", "label": "studied in"}},
-        {"data": {"source": "muscle-atrophy", "target": "mouse", "label": "observed in"}},
-        {"data": {"source": "bone-loss", "target": "human", "label": "measured in"}},
-        {"data": {"source": "neural-changes", "target": "human", "label": "detected in"}}
-    ]
-}
+# Compress JSON responses larger than 1KB; experiment lists and the graph are highly repetitive
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+def load_mock_data():
+    """Import the mock dataset on first use; the OSDR happy path never needs it"""
+    import _mock
+    return _mock
+
+def json_bytes_response(content: bytes) -> Response:
+    """Wrap an already-encoded JSON payload in a response"""
+    return Response(content=content, media_type="application/json")
 
+# Lets Vercel's edge cache and browsers reuse responses without invoking the function
+CACHE_CONTROL = "public, s-maxage=300, stale-while-revalidate=600"
+
+def json_etag(content: bytes) -> str:
+    """Strong ETag for an encoded JSON payload"""
+    return f'"{hashlib.md5(content).hexdigest()}"'
+
+def cacheable_json_response(request: Request, content: bytes, etag: Optional[str] = None) -> Response:
+    """Serve encoded JSON with cache headers, or a bare 304 if the client's copy is current"""
+    etag = etag or json_etag(content)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+# Handlers return ORJSONResponse directly: FastAPI then skips the jsonable_encoder
+# pass it would otherwise run over returned dicts before encoding them.
 @app.get("/")
 async def root():
-    return {"message": "NULLspace API v2.0 - NASA Bioscience Data Explorer"}
+    return ORJSONResponse({"message": "NULLspace API v2.0 - NASA Bioscience Data Explorer"})
 
 @app.get("/api/experiments")
-async def get_experiments():
+async def get_experiments(request: Request):
     """Get all NASA bioscience experiments from OSDR API"""
     try:
         experiments = await fetch_nasa_experiments()
         if experiments:
-            return {"experiments": experiments, "dataSource": "NASA OSDR", "isRealData": True}
+            # Mock fallbacks below stay uncached so the edge doesn't pin them while OSDR is down
+            return cacheable_json_response(
+                request,
+                orjson.dumps({"experiments": experiments, "dataSource": "NASA OSDR", "isRealData": True})
+            )
         else:
             # Fallback to mock data if NASA API returns no results
-            return {"experiments": mock_experiments, "dataSource": "Mock Data", "isRealData": False}
+            return json_bytes_response(load_mock_data().mock_experiments_json)
     except Exception as e:
         # Fallback to mock data if NASA API fails
         logger.error(f"NASA API failed, using fallback data: {str(e)}")
-        return {"experiments": mock_experiments, "dataSource": "Mock Data (API Error)", "isRealData": False}
+        return json_bytes_response(load_mock_data().mock_experiments_error_json)
 
 @app.get("/api/knowledge-graph")
-async def get_knowledge_graph():
+async def get_knowledge_graph(request: Request):
     """Get knowledge graph data"""
-    return mock_graph_data
+    mock_data = load_mock_data()
+    return cacheable_json_response(request, mock_data.mock_graph_json, mock_data.mock_graph_etag)
+
+# Seconds /api/search waits for OSDR before answering from the mock search. It has
+# to cover the client's connect timeout plus time to first byte, or a cold
+# instance would almost always answer from the mock data. The request left
+# running to fill the cache may be frozen once the response is sent on
+# serverless hosts, so don't count on it.
+SEARCH_UPSTREAM_WAIT = float(os.environ.get("SEARCH_UPSTREAM_WAIT", "2.0"))
+
+# Strong references to upstream requests left running after their caller moved on
+background_tasks = set()
 
 @app.get("/api/search")
 async def search_experiments(query: str = ""):
@@ -383,38 +514,37 @@ async def search_experiments(query: str = ""):
         try:
             experiments = await fetch_nasa_experiments()
             if experiments:
-                return {"results": experiments, "dataSource": "NASA OSDR", "isRealData": True}
+                return ORJSONResponse({"results": experiments, "dataSource": "NASA OSDR", "isRealData": True})
             else:
-                return {"results": mock_experiments, "dataSource": "Mock Data", "isRealData": False}
+                return json_bytes_response(load_mock_data().mock_results_json)
         except Exception as e:
             logger.error(f"NASA API failed in search: {str(e)}")
-            return {"results": mock_experiments, "dataSource": "Mock Data (API Error)", "isRealData": False}
+            return json_bytes_response(load_mock_data().mock_results_error_json)
     
     try:
-        # Try NASA API search first
-        nasa_results = await search_nasa_experiments(query)
-        if nasa_results:
-            return {"results": nasa_results, "query": query, "dataSource": "NASA OSDR", "isRealData": True}
+        # Try NASA API search first, but only wait briefly for it; a slow OSDR is
+        # answered from the local search instead. The request isn't cancelled so
+        # it still fills the result cache for the next caller.
+        nasa_task = asyncio.ensure_future(search_nasa_experiments(query))
+        done, _ = await asyncio.wait({nasa_task}, timeout=SEARCH_UPSTREAM_WAIT)
+        if nasa_task in done:
+            nasa_results = nasa_task.result()
+            if nasa_results:
+                return ORJSONResponse({"results": nasa_results, "query": query, "dataSource": "NASA OSDR", "isRealData": True})
+        else:
+            background_tasks.add(nasa_task)
+            nasa_task.add_done_callback(background_tasks.discard)
     except Exception as e:
         logger.error(f"NASA search API failed: {str(e)}")
     
     # Fallback to mock data search
-    query_lower = query.lower()
-    filtered = []
-    
-    for exp in mock_experiments:
-        # Search in title, organism, summary, and keywords
-        if (query_lower in exp["title"].lower() or
-            query_lower in exp["organism"].lower() or
-            query_lower in exp["summary"].lower() or
-            any(query_lower in keyword.lower() for keyword in exp["keywords"])):
-            filtered.append(exp)
+    filtered = load_mock_data().search_mock_experiments(query)
     
-    return {"results": filtered, "query": query, "dataSource": "Mock Data", "isRealData": False}
+    return ORJSONResponse({"results": filtered, "query": query, "dataSource": "Mock Data", "isRealData": False})
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "2.0.0"}
+    return ORJSONResponse({"status": "healthy", "version": "2.0.0"})
 
 # For Vercel deployment
 handler = app
\ No newline at end of file
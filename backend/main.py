@@ -1,10 +1,17 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import List, Dict, Optional, Tuple
+from contextlib import asynccontextmanager
 import os
 import sys
 import json
+import time
+import asyncio
+import hashlib
+import heapq
+import orjson
 from pathlib import Path
 
 # Add the project root to Python path
@@ -15,11 +22,21 @@ sys.path.insert(0, str(project_root))
 from ai.summarizer import ExperimentSummarizer
 from ai.knowledge_graph import KnowledgeGraphGenerator
 from data.nasa_client import NASADataClient
+from data.caching import async_ttl_cache
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the NASA client's HTTP session at startup and close it on shutdown"""
+    await nasa_client.startup()
+    yield
+    await nasa_client.close()
 
 app = FastAPI(
     title="NULLspace API",
     description="NASA Bioscience Data Explorer Backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS for frontend
@@ -27,10 +44,14 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],  # React dev server
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
+# Compress JSON payloads for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Initialize AI components
 summarizer = ExperimentSummarizer()
 knowledge_graph = KnowledgeGraphGenerator()
@@ -44,27 +65,89 @@ async def root():
         "status": "operational"
     }
 
+def encode_json(content) -> Tuple[bytes, str]:
+    """Encode a payload as a JSON response body, along with its ETag"""
+    body = ORJSONResponse(content=content).body
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+def cached_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve an encoded JSON body with cache headers, or a bare 304 if the client's copy is current"""
+    headers = {"ETag": etag, "Cache-Control": "max-age=60"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Encoded /api/experiments bodies: (search, organism, limit) -> (stored at, body, etag)
+EXPERIMENTS_CACHE_TTL = 300
+EXPERIMENTS_CACHE_SIZE = 512
+experiments_cache: Dict[tuple, Tuple[float, bytes, str]] = {}
+
+def cache_experiments_body(key: tuple, body: bytes):
+    """Store an encoded experiments body, evicting the oldest entry when full"""
+    experiments_cache.pop(key, None)
+    if len(experiments_cache) >= EXPERIMENTS_CACHE_SIZE:
+        experiments_cache.pop(next(iter(experiments_cache)))
+    experiments_cache[key] = (time.monotonic(), body, f'"{hashlib.md5(body).hexdigest()}"')
+
+async def enrich_experiment(experiment: Dict, semaphore: asyncio.Semaphore) -> Dict:
+    """Return a copy of an experiment with an AI-generated summary and keywords
+    
+    The client's records back its search indexes, so they're never modified.
+    """
+    try:
+        async with semaphore:
+            return {**experiment, **await summarizer.summarize_and_extract(experiment)}
+    except Exception as e:
+        print(f"Error enriching experiment {experiment.get('id')}: {e}")
+    return experiment
+
+async def stream_experiments(key: tuple, experiments: List[Dict]):
+    """Yield the {"experiments": [...]} body, emitting each experiment as soon as it is enriched
+    
+    Experiments that already have a summary go first; the rest follow in
+    completion order. The full body is cached once the stream finishes.
+    """
+    semaphore = asyncio.Semaphore(8)
+    ready = [experiment for experiment in experiments if experiment.get('summary')]
+    pending = [enrich_experiment(experiment, semaphore)
+               for experiment in experiments if not experiment.get('summary')]
+    
+    chunks = [b'{"experiments":[']
+    yield chunks[0]
+    for position, experiment in enumerate(ready):
+        chunks.append((b',' if position else b'') + orjson.dumps(experiment))
+        yield chunks[-1]
+    for position, enriched in enumerate(asyncio.as_completed(pending), len(ready)):
+        chunks.append((b',' if position else b'') + orjson.dumps(await enriched))
+        yield chunks[-1]
+    chunks.append(b']}')
+    yield chunks[-1]
+    
+    cache_experiments_body(key, b''.join(chunks))
+
 @app.get("/api/experiments")
 async def get_experiments(
+    request: Request,
     search: Optional[str] = None,
     organism: Optional[str] = None,
     limit: int = 50
 ):
     """Get NASA bioscience experiments with optional filtering"""
     try:
+        # Repeat queries are served from the encoded-response cache
+        key = (search, organism, limit)
+        entry = experiments_cache.get(key)
+        if entry and time.monotonic() - entry[0] < EXPERIMENTS_CACHE_TTL:
+            return cached_json_response(request, entry[1], entry[2])
+        
         experiments = await nasa_client.get_experiments(
             search_term=search,
             organism=organism,
             limit=limit
         )
         
-        # Add AI-generated summaries
-        for experiment in experiments:
-            if not experiment.get('summary'):
-                experiment['summary'] = await summarizer.generate_summary(experiment)
-                experiment['keywords'] = await summarizer.extract_keywords(experiment)
-        
-        return JSONResponse(content={"experiments": experiments})
+        # Stream experiments out as their AI-generated summaries complete
+        return StreamingResponse(stream_experiments(key, experiments), media_type="application/json")
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -78,12 +161,19 @@ async def get_experiment_detail(experiment_id: str):
         if not experiment:
             raise HTTPException(status_code=404, detail="Experiment not found")
         
-        # Generate enhanced details
-        experiment['summary'] = await summarizer.generate_summary(experiment)
-        experiment['keywords'] = await summarizer.extract_keywords(experiment)
-        experiment['related_experiments'] = await nasa_client.get_related_experiments(experiment_id)
+        # Generate enhanced details concurrently, on a copy of the shared record
+        summary, keywords, related_experiments = await asyncio.gather(
+            summarizer.generate_summary(experiment),
+            summarizer.extract_keywords(experiment),
+            nasa_client.get_related_experiments(experiment_id)
+        )
         
-        return JSONResponse(content=experiment)
+        return ORJSONResponse(content={
+            **experiment,
+            'summary': summary,
+            'keywords': keywords,
+            'related_experiments': related_experiments
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -99,32 +189,46 @@ async def get_knowledge_graph(experiment_ids: Optional[str] = None):
             experiments = await nasa_client.get_experiments(limit=10)
             exp_ids = [exp['id'] for exp in experiments]
         
+        # Graphs are cached per id set by the generator
         graph_data = await knowledge_graph.generate_graph(exp_ids)
         
-        return JSONResponse(content=graph_data)
+        return ORJSONResponse(content=graph_data)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@async_ttl_cache(maxsize=512, ttl=300)
+async def render_search(query: str, limit: int) -> Tuple[bytes, str]:
+    """Semantic search results with AI summaries and relevance, encoded for the response"""
+    # Use semantic search for better results, with embeddings when the models are available
+    encoder = await summarizer.get_sentence_encoder()
+    results = await nasa_client.semantic_search(query, limit=limit, encoder=encoder)
+    
+    # Enhance with AI summaries, scoring all results concurrently
+    async def enrich(result):
+        result['summary'], result['relevance_score'] = await asyncio.gather(
+            summarizer.generate_summary(result),
+            summarizer.calculate_relevance(query, result)
+        )
+    
+    await asyncio.gather(*(enrich(result) for result in results))
+    
+    # Sort by relevance
+    results = heapq.nlargest(limit, results, key=lambda x: x.get('relevance_score', 0))
+    
+    return encode_json({"results": results, "query": query})
+
 @app.get("/api/search")
 async def search_experiments(
+    request: Request,
     query: str,
     limit: int = 20
 ):
     """Intelligent search across experiments using AI similarity"""
     try:
-        # Use semantic search for better results
-        results = await nasa_client.semantic_search(query, limit=limit)
-        
-        # Enhance with AI summaries
-        for result in results:
-            result['summary'] = await summarizer.generate_summary(result)
-            result['relevance_score'] = await summarizer.calculate_relevance(query, result)
-        
-        # Sort by relevance
-        results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        
-        return JSONResponse(content={"results": results, "query": query})
+        # Repeat queries are served from the encoded-response cache
+        body, etag = await render_search(query, limit)
+        return cached_json_response(request, body, etag)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -135,11 +239,21 @@ async def get_platform_stats():
     try:
         stats = await nasa_client.get_platform_stats()
         
-        return JSONResponse(content=stats)
+        return ORJSONResponse(content=stats)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # uvloop and httptools come with uvicorn[standard]. Auto-reload is for development;
+    # set UVICORN_RELOAD=false in production and WEB_CONCURRENCY for multiple workers
+    # (each worker loads its own copy of the models).
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=os.environ.get("UVICORN_RELOAD", "true").lower() == "true",
+        loop="uvloop",
+        http="httptools"
+    )
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Result caching shared by the backend and the data clients
+"""
+import time
+from functools import wraps
+from typing import Dict
+
+def async_ttl_cache(maxsize: int, ttl: float):
+    """Cache non-empty results of an async function per argument tuple for ttl seconds
+    
+    Empty results (None, [], ...) are how callers report a failed upstream call,
+    so they are never cached and the next call retries. Cached results are
+    shared between callers; treat them as read-only.
+    """
+    def decorator(func):
+        cache: Dict[tuple, tuple] = {}  # key -> (stored at, result)
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            entry = cache.get(key)
+            if entry and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+            
+            result = await func(*args, **kwargs)
+            if result:
+                cache.pop(key, None)
+                if len(cache) >= maxsize:
+                    # Evict the oldest entry
+                    cache.pop(next(iter(cache)))
+                cache[key] = (time.monotonic(), result)
+            return result
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
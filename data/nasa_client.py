@@ -2,28 +2,81 @@
 NASA data client for fetching bioscience experiments
 """
 import asyncio
+import heapq
 import aiohttp
 import json
-from typing import Dict, List, Optional
+import mmap
+import numpy as np
+import orjson
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from functools import lru_cache
 from pathlib import Path
 import os
 
+class _SearchRow(NamedTuple):
+    """Pre-lowercased search fields of one experiment"""
+    # Title, description, organism and keywords as one NUL-separated UTF-8 blob
+    blob: bytes
+    organism: str
+    keywords: Tuple[str, ...]
+
+def _is_experiment_record(exp) -> bool:
+    """Whether a loaded record has the fields the search index reads, with the right types"""
+    if not isinstance(exp, dict) or not isinstance(exp.get('id'), str):
+        return False
+    if not all(isinstance(exp.get(field, ''), str) for field in ('title', 'description', 'organism')):
+        return False
+    keywords = exp.get('keywords', [])
+    return isinstance(keywords, list) and all(isinstance(kw, str) for kw in keywords)
+
 class NASADataClient:
+    # Minimum cosine similarity for an embedding match to count as a search hit
+    SEMANTIC_MATCH_THRESHOLD = 0.40
+    
+    # Number of normalized query embeddings kept for repeat searches
+    QUERY_EMBEDDING_CACHE_SIZE = 1024
+    
     def __init__(self):
         self.genelab_base_url = "https://genelab-data.ndc.nasa.gov/genelab/data/study"
         self.session = None
         
-        # Cache for demo data
-        self.cache_dir = Path("data/cache")
+        # Cache for demo data, next to this module so it's found whatever
+        # directory the app is started from
+        self.cache_dir = Path(__file__).resolve().parent / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Mock data for demo purposes
-        self.mock_experiments = self._load_mock_data()
+        # Mock data for demo purposes, unless an exported dataset has been cached
+        self.mock_experiments = tuple(self._load_cached_experiments() or self._load_mock_data())
+        self._build_search_index()
+        
+        # The data is static, so statistics are computed once; recompute if it changes
+        self._platform_stats = self._compute_platform_stats()
+        
+        # Embedding search state, filled on the first search given an encoder.
+        # Searches run in worker threads, so the query cache is guarded by a lock
+        self._doc_embeddings = None
+        self._query_embeddings = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
+    
+    async def startup(self):
+        """Open the shared aiohttp session used for the lifetime of the app"""
+        if self.session is None or self.session.closed:
+            # Pooled, keep-alive connections with cached DNS so requests skip the handshake
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=200,
+                    limit_per_host=50,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                )
+            )
     
     async def get_session(self):
-        """Get or create aiohttp session"""
+        """Get the shared aiohttp session, opening it if startup hasn't run"""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            await self.startup()
         return self.session
     
     async def close(self):
@@ -31,6 +84,69 @@ class NASADataClient:
         if self.session and not self.session.closed:
             await self.session.close()
     
+    def _build_search_index(self):
+        """Lowercase the searchable fields of the mock data once, as rows parallel to it"""
+        self._position_by_id = {exp['id']: i for i, exp in enumerate(self.mock_experiments)}
+        
+        # The NUL-separated blob makes the search filter a single bytes scan
+        self._search_rows = tuple(
+            _SearchRow(
+                blob='\0'.join([
+                    exp.get('title', ''),
+                    exp.get('description', ''),
+                    exp.get('organism', ''),
+                    *exp.get('keywords', [])
+                ]).lower().encode('utf-8'),
+                organism=exp.get('organism', '').lower(),
+                keywords=tuple(kw.lower() for kw in exp.get('keywords', []))
+            )
+            for exp in self.mock_experiments
+        )
+        
+        # Keyword incidence matrix (experiment x lowercased keyword) and organism codes,
+        # so related-experiment scores for the whole corpus are a couple of array ops
+        vocabulary = {}
+        for row in self._search_rows:
+            for kw in row.keywords:
+                vocabulary.setdefault(kw, len(vocabulary))
+        self._keyword_matrix = np.zeros((len(self.mock_experiments), len(vocabulary)), dtype=np.int32)
+        for i, row in enumerate(self._search_rows):
+            self._keyword_matrix[i, [vocabulary[kw] for kw in row.keywords]] = 1
+        organism_codes = {}
+        self._organism_codes = np.array(
+            [organism_codes.setdefault(row.organism, len(organism_codes)) for row in self._search_rows],
+            dtype=np.int32
+        )
+        self._searchable_texts = [
+            ' '.join([
+                exp.get('title', ''),
+                exp.get('description', ''),
+                exp.get('organism', ''),
+                ' '.join(exp.get('keywords', []))
+            ]).lower()
+            for exp in self.mock_experiments
+        ]
+        
+        # Inverted index: whitespace-delimited token of the searchable text -> positions
+        # of the experiments containing it. Query terms never contain whitespace, so a
+        # term occurs in a text exactly when it occurs inside one of the text's tokens.
+        self._token_postings = defaultdict(set)
+        for i, text in enumerate(self._searchable_texts):
+            for token in text.split():
+                self._token_postings[token].add(i)
+        
+        # Resolved query terms are memoized, so a repeated term is one hash lookup
+        self._term_column = lru_cache(maxsize=4096)(self._scan_term_column)
+    
+    def _scan_term_column(self, term: str) -> np.ndarray:
+        """0/1 column over the experiments marking those whose searchable text contains term"""
+        column = np.zeros(len(self.mock_experiments), dtype=np.int32)
+        for token, postings in self._token_postings.items():
+            if term in token:
+                column[list(postings)] = 1
+        column.setflags(write=False)
+        return column
+    
     async def get_experiments(
         self,
         search_term: Optional[str] = None,
@@ -40,111 +156,146 @@ class NASADataClient:
         """Fetch NASA bioscience experiments"""
         try:
             # For MVP, use mock data with filtering
-            experiments = self.mock_experiments.copy()
+            positions = range(len(self.mock_experiments))
             
-            # Apply filters
+            # Apply filters against the pre-lowercased fields
             if search_term:
-                search_lower = search_term.lower()
-                experiments = [
-                    exp for exp in experiments
-                    if (search_lower in exp.get('title', '').lower() or
-                        search_lower in exp.get('description', '').lower() or
-                        search_lower in exp.get('organism', '').lower() or
-                        any(search_lower in kw.lower() for kw in exp.get('keywords', [])))
-                ]
+                needle = search_term.lower().encode('utf-8')
+                # The NUL separator keeps matches inside a single field; a term
+                # containing NUL could only match across fields
+                positions = [
+                    i for i in positions
+                    if needle in self._search_rows[i].blob
+                ] if b'\0' not in needle else []
             
             if organism:
                 organism_lower = organism.lower()
-                experiments = [
-                    exp for exp in experiments
-                    if organism_lower in exp.get('organism', '').lower()
+                positions = [
+                    i for i in positions
+                    if organism_lower in self._search_rows[i].organism
                 ]
             
-            return experiments[:limit]
+            return [self.mock_experiments[i] for i in positions[:limit]]
             
         except Exception as e:
             print(f"Error fetching experiments: {e}")
-            return self.mock_experiments[:limit]
+            return list(self.mock_experiments[:limit])
     
     async def get_experiment_by_id(self, experiment_id: str) -> Optional[Dict]:
         """Get detailed experiment data by ID"""
         try:
             # Find in mock data
-            for exp in self.mock_experiments:
-                if exp['id'] == experiment_id:
-                    return exp
-            
-            return None
+            position = self._position_by_id.get(experiment_id)
+            return self.mock_experiments[position] if position is not None else None
             
         except Exception as e:
             print(f"Error fetching experiment {experiment_id}: {e}")
             return None
     
+    async def get_experiments_by_ids(self, experiment_ids: List[str]) -> List[Optional[Dict]]:
+        """Get several experiments by ID; missing ones come back as None"""
+        # Lookups are plain dict hits, so there's nothing to overlap
+        positions = [self._position_by_id.get(exp_id) for exp_id in experiment_ids]
+        return [self.mock_experiments[position] if position is not None else None for position in positions]
+    
     async def get_related_experiments(self, experiment_id: str, limit: int = 5) -> List[Dict]:
         """Find experiments related to the given one"""
         try:
-            base_exp = await self.get_experiment_by_id(experiment_id)
-            if not base_exp:
+            base_position = self._position_by_id.get(experiment_id)
+            if base_position is None:
                 return []
             
-            base_keywords = set(kw.lower() for kw in base_exp.get('keywords', []))
-            base_organism = base_exp.get('organism', '').lower()
-            
-            related = []
-            for exp in self.mock_experiments:
-                if exp['id'] == experiment_id:
-                    continue
-                
-                # Calculate similarity score
-                exp_keywords = set(kw.lower() for kw in exp.get('keywords', []))
-                keyword_overlap = len(base_keywords & exp_keywords)
-                organism_match = 1 if base_organism == exp.get('organism', '').lower() else 0
-                
-                similarity_score = keyword_overlap + organism_match
-                
-                if similarity_score > 0:
-                    exp_copy = exp.copy()
-                    exp_copy['similarity_score'] = similarity_score
-                    related.append(exp_copy)
+            # Calculate similarity scores for every experiment at once:
+            # shared keywords plus one point for the same organism
+            keyword_overlap = self._keyword_matrix @ self._keyword_matrix[base_position]
+            organism_match = self._organism_codes == self._organism_codes[base_position]
+            similarity_scores = keyword_overlap + organism_match
+            similarity_scores[base_position] = 0
             
-            # Sort by similarity and return top results
-            related.sort(key=lambda x: x['similarity_score'], reverse=True)
-            return related[:limit]
+            # Pick the top results by similarity, then copy only those experiments
+            scores = similarity_scores.tolist()
+            candidates = [i for i, score in enumerate(scores) if score > 0]
+            top = heapq.nlargest(limit, candidates, key=scores.__getitem__)
+            return [
+                {**self.mock_experiments[i], 'similarity_score': scores[i]}
+                for i in top
+            ]
             
         except Exception as e:
             print(f"Error finding related experiments: {e}")
             return []
     
-    async def semantic_search(self, query: str, limit: int = 20) -> List[Dict]:
-        """Perform semantic search across experiments"""
-        # For MVP, use simple keyword matching
-        # In production, use sentence transformers for semantic similarity
+    async def semantic_search(self, query: str, limit: int = 20, encoder=None) -> List[Dict]:
+        """Perform semantic search across experiments
+        
+        With a sentence-transformers encoder, experiments are ranked by embedding
+        similarity to the query; keyword matching is the fallback when there is no
+        encoder or nothing is similar enough.
+        """
+        if encoder is not None:
+            try:
+                # Encoding is CPU-bound, so it runs in a worker thread
+                results = await asyncio.to_thread(self._embedding_search, query, limit, encoder)
+                if results:
+                    return results
+            except Exception as e:
+                print(f"Error in embedding search: {e}")
         
         query_terms = set(query.lower().split())
-        results = []
+        if not query_terms:
+            return []
         
-        for exp in self.mock_experiments:
-            # Create searchable text
-            searchable_text = ' '.join([
-                exp.get('title', ''),
-                exp.get('description', ''),
-                exp.get('organism', ''),
-                ' '.join(exp.get('keywords', []))
-            ]).lower()
-            
-            # Simple term matching
-            matches = sum(1 for term in query_terms if term in searchable_text)
-            if matches > 0:
-                exp_copy = exp.copy()
-                exp_copy['search_score'] = matches / len(query_terms)
-                results.append(exp_copy)
+        # Simple term matching: per-experiment match counts are the sum of the
+        # terms' incidence columns
+        matches_per_exp = np.sum([self._term_column(term) for term in query_terms], axis=0)
         
-        # Sort by relevance
-        results.sort(key=lambda x: x['search_score'], reverse=True)
-        return results[:limit]
+        # Most matches first, ties in corpus order; then copy only those experiments
+        matched = np.flatnonzero(matches_per_exp)
+        top = matched[np.argsort(-matches_per_exp[matched], kind='stable')][:limit]
+        return [
+            {**self.mock_experiments[i], 'search_score': int(matches_per_exp[i]) / len(query_terms)}
+            for i in top
+        ]
+    
+    def _embedding_search(self, query: str, limit: int, encoder) -> List[Dict]:
+        """Rank experiments by cosine similarity between query and document embeddings"""
+        if self._doc_embeddings is None:
+            # Embed the whole corpus once; normalized, so inner product is cosine similarity
+            self._doc_embeddings = np.asarray(
+                encoder.encode(self._searchable_texts, normalize_embeddings=True)
+            )
+        
+        # Repeat queries reuse their embedding instead of running the encoder again
+        cache_key = query.strip().lower()
+        with self._query_embeddings_lock:
+            query_embedding = self._query_embeddings.get(cache_key)
+            if query_embedding is not None:
+                self._query_embeddings.move_to_end(cache_key)
+        if query_embedding is None:
+            query_embedding = np.asarray(encoder.encode(cache_key, normalize_embeddings=True))
+            with self._query_embeddings_lock:
+                self._query_embeddings[cache_key] = query_embedding
+                if len(self._query_embeddings) > self.QUERY_EMBEDDING_CACHE_SIZE:
+                    self._query_embeddings.popitem(last=False)
+        
+        scores = self._doc_embeddings @ query_embedding
+        top = np.argsort(-scores, kind='stable')[:limit]
+        
+        results = []
+        for i in top:
+            if scores[i] < self.SEMANTIC_MATCH_THRESHOLD:
+                break
+            exp_copy = self.mock_experiments[i].copy()
+            exp_copy['search_score'] = float(scores[i])
+            results.append(exp_copy)
+        return results
     
     async def get_platform_stats(self) -> Dict:
         """Get platform statistics"""
+        return self._platform_stats
+    
+    def _compute_platform_stats(self) -> Dict:
+        """Compute platform statistics for the loaded experiments"""
         return {
             'total_experiments': len(self.mock_experiments),
             'organisms_studied': len(set(exp.get('organism', '') for exp in self.mock_experiments)),
@@ -153,6 +304,42 @@ class NASADataClient:
             'last_updated': '2024-10-05T00:00:00Z'
         }
     
+    def _load_cached_experiments(self) -> Optional[List[Dict]]:
+        """Load experiments exported to data/cache/experiments.json, if present
+        
+        The file is a JSON array of experiment records in the demo data's shape,
+        written by export_mock_data. It is memory-mapped and parsed by orjson
+        straight from the mapping, so large exports aren't read into an
+        intermediate bytes copy. Anything that isn't a list of such records is
+        ignored, so the built-in data is used instead.
+        """
+        path = self.cache_dir / "experiments.json"
+        try:
+            if not path.is_file() or path.stat().st_size == 0:
+                return None
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    experiments = orjson.loads(view)
+        except Exception as e:
+            print(f"Error loading cached experiments: {e}")
+            return None
+        
+        if not isinstance(experiments, list) or not all(_is_experiment_record(exp) for exp in experiments):
+            print(f"Ignoring {path}: not a list of experiment records")
+            return None
+        return experiments
+    
+    def export_mock_data(self):
+        """Write the built-in demo data to data/cache/experiments.json for later starts to load
+        
+        Written beside the target and renamed over it, so a client starting up
+        never reads a partial file.
+        """
+        path = self.cache_dir / "experiments.json"
+        tmp_path = path.with_suffix('.json.tmp')
+        tmp_path.write_bytes(orjson.dumps(self._load_mock_data()))
+        tmp_path.replace(path)
+    
     def _load_mock_data(self) -> List[Dict]:
         """Load mock NASA experiment data for demo"""
         return [
@@ -260,4 +447,9 @@ class NASADataClient:
                 'publication_count': 5,
                 'dataset_size_gb': 1.9
             }
-        ]
\ No newline at end of file
+        ]
+
+if __name__ == "__main__":
+    # One-time dev step: python data/nasa_client.py rebuilds the cached demo data
+    NASADataClient().export_mock_data()
+    print("Wrote data/cache/experiments.json")
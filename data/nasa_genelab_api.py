@@ -4,82 +4,595 @@ Fetches real experiment data from NASA's GeneLab database
 """
 import requests
 import json
-from typing import List, Dict, Any, Optional
+import orjson
+import ijson
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 import asyncio
-import aiohttp
+import httpx
 from datetime import datetime
 import logging
+from collections import OrderedDict, defaultdict
+from functools import lru_cache, reduce
+import re
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import urlencode
+
+from data.caching import async_ttl_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def compile_keyword_matcher(keywords: Tuple[str, ...]):
+    """Build a function returning, in table order, the keywords that occur in a text
+    
+    All keywords are found in one C-level regex scan. The lookahead lets matches
+    overlap; alternatives are tried longest first, so a keyword nested at the
+    start of a longer one ('space' in 'spaceflight') is recovered from the
+    implied table.
+    """
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    pattern = re.compile(f"(?=({alternation}))")
+    implied = {k: frozenset(other for other in keywords if other in k) for k in keywords}
+    
+    def match(text: str) -> List[str]:
+        found = set()
+        for hit in set(pattern.findall(text)):
+            found |= implied[hit]
+        return [k for k in keywords if k in found]
+    
+    return match
+
+# Space-related keywords tagged on studies whose title or description mention them
+STUDY_SPACE_KEYWORDS = ('microgravity', 'spaceflight', 'space', 'ISS', 'gene expression',
+                        'muscle atrophy', 'bone density', 'cardiovascular', 'radiation')
+OSDR_SPACE_KEYWORDS = ('microgravity', 'spaceflight', 'space', 'ISS', 'bone',
+                       'muscle', 'cardiovascular', 'radiation', 'gene expression',
+                       'inflammation', 'immune')
+match_study_space_keywords = compile_keyword_matcher(STUDY_SPACE_KEYWORDS)
+match_osdr_space_keywords = compile_keyword_matcher(OSDR_SPACE_KEYWORDS)
+
+# Assay types whose studies are estimated as large / medium datasets, each
+# table compiled to one alternation so a study's assay text is scanned once per table
+HIGH_DATA_ASSAY_TYPES = ('rna-seq', 'microarray', 'proteomics', 'genomics', 'imaging')
+MEDIUM_DATA_ASSAY_TYPES = ('flow cytometry', 'pcr', 'biochemistry')
+_HIGH_DATA_ASSAY_RE = re.compile("|".join(map(re.escape, HIGH_DATA_ASSAY_TYPES)))
+_MEDIUM_DATA_ASSAY_RE = re.compile("|".join(map(re.escape, MEDIUM_DATA_ASSAY_TYPES)))
+
+# max-age directive of a lowercased Cache-Control header
+_MAX_AGE_RE = re.compile(r'\bmax-age=(\d+)')
+
+# strptime formats tried, in order, for dates that aren't ISO 8601
+DATE_FORMATS = ('%d-%b-%Y', '%m/%d/%Y', '%Y-%m-%d')
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str) -> Optional[datetime]:
+    """Parse a date string from the API, or return None if no known format fits
+    
+    ISO 8601 takes the C-level fromisoformat fast path; other formats fall back
+    to strptime. Results are memoized, since the same mission and release dates
+    recur across many studies.
+    """
+    # The string's shape picks the likely format, so common dates parse on the
+    # first attempt instead of after failed ones: '01/31/2020', '01-Jan-2020'
+    if '/' in text:
+        likely = '%m/%d/%Y'
+    elif text[1:2] == '-' or text[2:3] == '-':
+        likely = '%d-%b-%Y'
+    else:
+        likely = None
+    if likely is not None:
+        try:
+            return datetime.strptime(text, likely)
+        except ValueError:
+            pass
+    
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        if date_format == likely:
+            continue
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+@lru_cache(maxsize=256)
+def build_search_url(base_url: str, query: str, size: int) -> str:
+    """OSDR search URL for a query and page size, encoded once per distinct combination
+    
+    The encoded URL doubles as the response cache key.
+    """
+    return f"{base_url}?{urlencode({'q': query, 'size': size, 'from': 0})}"
+
+# OSDR query for the default experiment listing
+DEFAULT_SEARCH_QUERY = 'spaceflight OR microgravity OR space OR ISS'
+
+# Enhanced fallback data served when the API fails
+FALLBACK_DATA = [
+    {
+        'id': 'GLDS-21',
+        'title': 'Spaceflight Effects on Arabidopsis Gene Expression',
+        'summary': 'Investigation of how microgravity affects plant gene expression patterns in Arabidopsis thaliana during spaceflight missions.',
+        'organism': 'Arabidopsis thaliana',
+        'mission': 'STS-131',
+        'keywords': ['microgravity', 'gene expression', 'plants', 'spaceflight', 'arabidopsis'],
+        'dataTypes': ['RNA-Seq', 'Microarray'],
+        'publicationCount': 12,
+        'duration': '14 days',
+        'factors': [
+            {'name': 'Spaceflight', 'value': 'Flight'},
+            {'name': 'Duration', 'value': '14 days'}
+        ]
+    },
+    {
+        'id': 'GLDS-47',
+        'title': 'Muscle Atrophy in Microgravity',
+        'summary': 'Study of muscle protein degradation pathways in mouse models under simulated microgravity conditions.',
+        'organism': 'Mus musculus',
+        'mission': 'Rodent Research-1',
+        'keywords': ['muscle atrophy', 'microgravity', 'protein degradation', 'mice'],
+        'dataTypes': ['Proteomics', 'Histology'],
+        'publicationCount': 8,
+        'duration': '30 days',
+        'factors': [
+            {'name': 'Microgravity', 'value': 'Simulated'},
+            {'name': 'Duration', 'value': '30 days'}
+        ]
+    },
+    {
+        'id': 'GLDS-104',
+        'title': 'Cardiac Function in Space',
+        'summary': 'Analysis of cardiovascular adaptations and cardiac muscle changes during long-duration spaceflight.',
+        'organism': 'Homo sapiens',
+        'mission': 'ISS Expedition 42',
+        'keywords': ['cardiac', 'cardiovascular', 'spaceflight', 'adaptation'],
+        'dataTypes': ['Echocardiography', 'Blood Analysis'],
+        'publicationCount': 15,
+        'duration': '180 days',
+        'factors': [
+            {'name': 'Spaceflight', 'value': 'Long-duration'},
+            {'name': 'Environment', 'value': 'ISS'}
+        ]
+    },
+    {
+        'id': 'GLDS-78',
+        'title': 'Bone Density Loss Studies',
+        'summary': 'Investigation of bone mineral density changes and osteoblast activity in microgravity environments.',
+        'organism': 'Rattus norvegicus',
+        'mission': 'SpaceX CRS-12',
+        'keywords': ['bone density', 'osteoblast', 'calcium', 'microgravity'],
+        'dataTypes': ['X-ray', 'Biochemistry'],
+        'publicationCount': 6,
+        'duration': '60 days',
+        'factors': [
+            {'name': 'Microgravity', 'value': 'True'},
+            {'name': 'Duration', 'value': '60 days'}
+        ]
+    },
+    {
+        'id': 'GLDS-242',
+        'title': 'Space Radiation Effects on DNA',
+        'summary': 'Comprehensive analysis of DNA damage and repair mechanisms in response to cosmic radiation exposure.',
+        'organism': 'Homo sapiens',
+        'mission': 'ISS Expedition 55',
+        'keywords': ['radiation', 'DNA damage', 'cosmic rays', 'repair mechanisms'],
+        'dataTypes': ['Genomics', 'DNA-Seq'],
+        'publicationCount': 9,
+        'duration': '120 days',
+        'factors': [
+            {'name': 'Radiation', 'value': 'Cosmic'},
+            {'name': 'Duration', 'value': '120 days'}
+        ]
+    },
+    {
+        'id': 'GLDS-173',
+        'title': 'Plant Growth in Microgravity',
+        'summary': 'Study of plant root development and gravitropism responses in microgravity conditions.',
+        'organism': 'Zea mays',
+        'mission': 'ISS Expedition 48',
+        'keywords': ['plant growth', 'root development', 'gravitropism', 'microgravity'],
+        'dataTypes': ['Microscopy', 'Time-lapse Imaging'],
+        'publicationCount': 5,
+        'duration': '28 days',
+        'factors': [
+            {'name': 'Gravity', 'value': 'Microgravity'},
+            {'name': 'Plant Type', 'value': 'Corn'}
+        ]
+    },
+    {
+        'id': 'GLDS-195',
+        'title': 'Immune System Changes in Space',
+        'summary': 'Investigation of immune system adaptations and T-cell function during spaceflight missions.',
+        'organism': 'Homo sapiens',
+        'mission': 'ISS Various Expeditions',
+        'keywords': ['immune system', 't-cells', 'spaceflight', 'immunology'],
+        'dataTypes': ['Flow Cytometry', 'Immunoassays'],
+        'publicationCount': 11,
+        'duration': 'Variable',
+        'factors': [
+            {'name': 'Environment', 'value': 'Spaceflight'},
+            {'name': 'System', 'value': 'Immune'}
+        ]
+    },
+    {
+        'id': 'GLDS-158',
+        'title': 'Fruit Fly Development in Zero-G',
+        'summary': 'Analysis of developmental biology and genetic expression in Drosophila melanogaster under microgravity.',
+        'organism': 'Drosophila melanogaster',
+        'mission': 'SpaceX CRS-8',
+        'keywords': ['development', 'drosophila', 'genetics', 'zero gravity'],
+        'dataTypes': ['RNA-Seq', 'Developmental Assays'],
+        'publicationCount': 7,
+        'duration': '21 days',
+        'factors': [
+            {'name': 'Gravity', 'value': 'Zero-G'},
+            {'name': 'Stage', 'value': 'Development'}
+        ]
+    }
+]
+
+# Per fallback entry: lowercased title, lowercased summary, keywords as-is and
+# lowercased organism, NUL-joined so a query is matched with one substring scan
+_FALLBACK_SEARCH_TEXTS = [
+    '\0'.join([exp['title'].lower(), exp['summary'].lower(), *exp['keywords'], exp['organism'].lower()])
+    for exp in FALLBACK_DATA
+]
+
+def _trigrams(text: str) -> set:
+    """Overlapping 3-character slices of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# Inverted index of trigrams of the search texts -> positions in FALLBACK_DATA.
+# Trigrams (rather than whole words) keep substring queries such as "micro" working:
+# any text containing the query contains all of the query's trigrams.
+_FALLBACK_SEARCH_INDEX = defaultdict(set)
+for _position, _text in enumerate(_FALLBACK_SEARCH_TEXTS):
+    for _gram in _trigrams(_text):
+        _FALLBACK_SEARCH_INDEX[_gram].add(_position)
+
+def search_fallback_data(query: str) -> List[Dict[str, Any]]:
+    """Filter the fallback data by a case-insensitive substring query, narrowed by the trigram index"""
+    query_lower = query.lower()
+    if '\0' in query_lower:
+        # Only the field separator could match a NUL
+        return []
+    
+    query_grams = _trigrams(query_lower)
+    if query_grams:
+        candidates = sorted(reduce(
+            set.intersection,
+            (_FALLBACK_SEARCH_INDEX.get(gram, set()) for gram in query_grams)
+        ))
+    else:
+        # Queries shorter than 3 characters can't use the index
+        candidates = range(len(FALLBACK_DATA))
+    
+    return [FALLBACK_DATA[i] for i in candidates if query_lower in _FALLBACK_SEARCH_TEXTS[i]]
+
+class _CachedResponse(NamedTuple):
+    """Row of the on-disk response cache"""
+    fetched_at: float
+    # Seconds after fetched_at the response may be served without revalidating
+    max_age: float
+    # Validators for conditional requests ('' when the server sent none)
+    etag: str
+    last_modified: str
+    # orjson-encoded body
+    payload: bytes
+
+class _StudyView(NamedTuple):
+    """Fields derived from a study detail record in one pass, shared by the extractors"""
+    # Lowercased title and description as one NUL-separated string
+    text: str
+    # Non-empty lowercased factor names, in order
+    factor_keywords: Tuple[str, ...]
+    # First factor naming a flight/mission, and first naming a duration/time (None if absent)
+    mission_factor: Optional[Dict]
+    duration_factor: Optional[Dict]
+    # The first 5 factors as {'name', 'value'} pairs
+    factors: List[Dict[str, str]]
+
 class NASAGeneLab:
     """NASA OSDR API client for fetching experiment data"""
     
+    # Seconds a cached API response stays valid; study metadata rarely changes
+    CACHE_TTL = 86400
+    
+    # Most processed search hits kept in memory
+    HIT_CACHE_SIZE = 2048
+    
+    # Largest response body accepted from the API; bigger ones are abandoned unread
+    MAX_RESPONSE_BYTES = 2 * 1024 * 1024
+    
     def __init__(self):
         self.base_url = "https://osdr.nasa.gov/osdr/data/search"
         self.api_url = "https://osdr.nasa.gov/osdr/data/study"
         self.search_url = "https://osdr.nasa.gov/osdr/data/search"
         
+        # Shared HTTP/2 client, created on first use so requests are multiplexed over kept-alive connections
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # Cache key -> task fetching that request, so concurrent callers share one GET
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # On-disk cache of successful API responses, opened on first use
+        self.cache_path = Path("data/cache") / "genelab.sqlite3"
+        self._cache_db: Optional[sqlite3.Connection] = None
+        
+        # (search hit _id, crc32 of its encoded _source) -> (processed at, experiment),
+        # oldest first, so a study seen again unchanged in another page or query
+        # isn't reprocessed, while one whose content changed is
+        self._hit_cache: OrderedDict = OrderedDict()
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it if needed"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers={'Accept': 'application/json'},
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+                timeout=30.0
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        if self._cache_db is not None:
+            self._cache_db.close()
+            self._cache_db = None
+    
+    async def _get_json(self, client: httpx.AsyncClient, url: str,
+                        params: Optional[Dict] = None,
+                        hits_limit: Optional[int] = None) -> Tuple[int, Optional[Dict]]:
+        """GET a JSON document, serving it from the on-disk cache while fresh
+        
+        Returns the HTTP status and the decoded body (None unless the status is 200).
+        Only successful responses are cached; a cache hit reports status 200.
+        Raises ValueError if the body is malformed JSON or over MAX_RESPONSE_BYTES.
+        With hits_limit, only the first hits_limit search hits are kept, as
+        {'hits': {'hits': [...]}}, and the body is read no further than that.
+        
+        Concurrent calls for the same request share one HTTP fetch, so the
+        returned body may be shared between callers; treat it as read-only.
+        """
+        cache_key = url + '?' + json.dumps(params, sort_keys=True) if params else url
+        cached = self._cache_get(cache_key)
+        if cached is not None and time.time() - cached.fetched_at < cached.max_age:
+            return 200, orjson.loads(cached.payload)
+        
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_json(client, url, params, hits_limit, cache_key, cached)
+            )
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        
+        # Shielded so a cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+    
+    async def _fetch_json(self, client: httpx.AsyncClient, url: str, params: Optional[Dict],
+                          hits_limit: Optional[int], cache_key: str,
+                          cached: Optional[_CachedResponse]) -> Tuple[int, Optional[Dict]]:
+        """Fetch a JSON document for _get_json and cache it if the request succeeded
+        
+        An expired cached copy is revalidated with a conditional GET, so an
+        unchanged document comes back as a bodiless 304. The server's
+        Cache-Control decides how long the result stays fresh (see _cache_lifetime).
+        """
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        
+        async with client.stream('GET', url, params=params, headers=headers or None) as response:
+            if response.status_code == 304 and cached is not None:
+                self._cache_touch(cache_key, self._cache_lifetime(response.headers) or 0.0)
+                return 200, orjson.loads(cached.payload)
+            if response.status_code != 200:
+                return response.status_code, None
+            if hits_limit is not None:
+                data = await self._read_hits(response, hits_limit)
+            else:
+                data = orjson.loads(b''.join([chunk async for chunk in self._iter_body(response)]))
+            etag = response.headers.get('ETag', '')
+            last_modified = response.headers.get('Last-Modified', '')
+            lifetime = self._cache_lifetime(response.headers)
+        
+        if lifetime is not None:
+            self._cache_set(cache_key, data, etag, last_modified, lifetime)
+        return 200, data
+    
+    def _cache_lifetime(self, headers) -> Optional[float]:
+        """Seconds a response may be served from the cache, or None if it mustn't be stored
+        
+        A Cache-Control max-age shortens the lifetime (it's capped at CACHE_TTL),
+        no-cache means revalidating on every use, and no-store means not caching.
+        """
+        cache_control = headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control:
+            return None
+        if 'no-cache' in cache_control:
+            return 0.0
+        max_age = _MAX_AGE_RE.search(cache_control)
+        if max_age:
+            return min(float(max_age.group(1)), self.CACHE_TTL)
+        return float(self.CACHE_TTL)
+    
+    async def _read_hits(self, response: httpx.Response, limit: int) -> Dict:
+        """Stream-parse the first limit hits of a search response body
+        
+        Hits are decoded one at a time as the body arrives and reading stops as
+        soon as limit of them are in, so the rest is neither downloaded nor parsed.
+        Malformed JSON raises ValueError as soon as the bad bytes arrive.
+        """
+        hits = ijson.sendable_list()
+        parser = ijson.items_coro(hits, 'hits.hits.item', use_float=True)
+        
+        try:
+            async for chunk in self._iter_body(response):
+                parser.send(chunk)
+                if len(hits) >= limit:
+                    break
+            else:
+                parser.close()
+        except ijson.JSONError as e:
+            raise ValueError(f"Malformed JSON response: {e}") from e
+        
+        return {'hits': {'hits': hits[:limit]}}
+    
+    async def _iter_body(self, response: httpx.Response):
+        """Yield a response body's chunks, raising ValueError once it passes MAX_RESPONSE_BYTES
+        
+        A declared Content-Length over the limit fails before anything is read.
+        """
+        limit = self.MAX_RESPONSE_BYTES
+        declared = response.headers.get('Content-Length', '')
+        if declared.isdigit() and int(declared) > limit:
+            raise ValueError(f"Response body of {declared} bytes exceeds {limit} bytes")
+        
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > limit:
+                raise ValueError(f"Response body exceeds {limit} bytes")
+            yield chunk
+    
+    def _get_cache_db(self) -> sqlite3.Connection:
+        """Open the response cache database, creating it if needed"""
+        if self._cache_db is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cache_db = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+            self._cache_db.execute(
+                "CREATE TABLE IF NOT EXISTS http_responses "
+                "(key TEXT PRIMARY KEY, fetched_at REAL, max_age REAL, etag TEXT, last_modified TEXT, payload BLOB)"
+            )
+            # Caches created before max_age was stored get the column added; their rows use CACHE_TTL
+            columns = {row[1] for row in self._cache_db.execute("PRAGMA table_info(http_responses)")}
+            if 'max_age' not in columns:
+                self._cache_db.execute("ALTER TABLE http_responses ADD COLUMN max_age REAL")
+        return self._cache_db
+    
+    def _cache_get(self, key: str) -> Optional[_CachedResponse]:
+        """Get the cached response for a request, fresh or not"""
+        try:
+            row = self._get_cache_db().execute(
+                "SELECT fetched_at, COALESCE(max_age, ?), etag, last_modified, payload "
+                "FROM http_responses WHERE key = ?", (self.CACHE_TTL, key)
+            ).fetchone()
+            if row:
+                return _CachedResponse(*row)
+        except Exception as e:
+            logger.warning(f"Error reading response cache: {str(e)}")
+        return None
+    
+    def _cache_set(self, key: str, payload: Dict, etag: str, last_modified: str, max_age: float):
+        """Store a response, its lifetime and its validators in the on-disk cache"""
+        try:
+            with self._get_cache_db() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO http_responses "
+                    "(key, fetched_at, max_age, etag, last_modified, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, time.time(), max_age, etag, last_modified, orjson.dumps(payload))
+                )
+        except Exception as e:
+            logger.warning(f"Error writing response cache: {str(e)}")
+    
+    def _cache_touch(self, key: str, max_age: float):
+        """Mark a cached response as fresh again after the server confirmed it unchanged"""
+        try:
+            with self._get_cache_db() as db:
+                db.execute(
+                    "UPDATE http_responses SET fetched_at = ?, max_age = ? WHERE key = ?",
+                    (time.time(), max_age, key)
+                )
+        except Exception as e:
+            logger.warning(f"Error writing response cache: {str(e)}")
+        
     async def fetch_experiments(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Fetch experiments from NASA GeneLab API"""
+        """Fetch experiments from NASA GeneLab API, or the fallback data if it fails"""
+        experiments = await self._search_osdr(DEFAULT_SEARCH_QUERY, limit)
+        if experiments is None:
+            logger.info("No studies from the OSDR API, using fallback data")
+            return self._get_fallback_data()
+        return experiments
+    
+    async def _search_osdr(self, query: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Search OSDR and process the hits, or None if the request failed or found nothing
+        
+        Callers decide what to serve instead; failures are logged here.
+        """
         try:
-            async with aiohttp.ClientSession() as session:
-                # Search for studies with space-related keywords (OSDR API format)
-                search_params = {
-                    'q': 'spaceflight OR microgravity OR space OR ISS',
-                    'size': limit,
-                    'from': 0
-                }
+            client = await self._get_client()
+            
+            # OSDR API format
+            search_url = build_search_url(self.search_url, query, limit)
+            
+            status, data = await self._get_json(client, search_url, hits_limit=limit)
+            if status != 200:
+                logger.error(f"API request failed with status: {status}")
+                return None
+            
+            # Handle OSDR API response format
+            study_hits = data.get('hits', {}).get('hits', [])
+            if not study_hits:
+                return None
+            
+            # Process and format the studies off the event loop
+            experiments = await asyncio.to_thread(self._process_osdr_hits, study_hits[:limit])
+            
+            logger.info(f"Successfully fetched {len(experiments)} experiments from NASA OSDR")
+            return experiments
                 
-                async with session.get(self.search_url, params=search_params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Handle OSDR API response format
-                        hits_data = data.get('hits', {})
-                        if isinstance(hits_data, dict):
-                            total_hits = hits_data.get('total', {})
-                            if isinstance(total_hits, dict):
-                                total_count = total_hits.get('value', 0)
-                            else:
-                                total_count = total_hits
-                            
-                            study_hits = hits_data.get('hits', [])
-                        else:
-                            total_count = 0
-                            study_hits = []
-                        
-                        # If no hits, use fallback data
-                        if total_count == 0 or not study_hits:
-                            logger.info("No studies found in OSDR API, using fallback data")
-                            return self._get_fallback_data()
-                        
-                        # Process and format the studies
-                        experiments = []
-                        for hit in study_hits[:limit]:
-                            experiment = self._process_osdr_hit(hit)
-                            if experiment:
-                                experiments.append(experiment)
-                        
-                        logger.info(f"Successfully fetched {len(experiments)} experiments from NASA OSDR")
-                        return experiments
-                    else:
-                        logger.error(f"API request failed with status: {response.status}")
-                        return self._get_fallback_data()
-                        
         except Exception as e:
             logger.error(f"Error fetching NASA GeneLab data: {str(e)}")
-            return self._get_fallback_data()
+            return None
+    
+    def _process_osdr_hits(self, hits: List[Dict]) -> List[Dict[str, Any]]:
+        """Process a page of OSDR search hits, dropping unusable ones
+        
+        Pure CPU with no shared state, so callers run it in a worker thread.
+        """
+        experiments = []
+        for hit in hits:
+            experiment = self._process_osdr_hit(hit)
+            if experiment:
+                experiments.append(experiment)
+        return experiments
     
     def _process_osdr_hit(self, hit: Dict) -> Optional[Dict[str, Any]]:
-        """Process individual OSDR search hit"""
+        """Process individual OSDR search hit
+        
+        Results are cached per hit _id and _source content for CACHE_TTL and shared
+        between callers; treat them as read-only.
+        """
         try:
             source = hit.get('_source', {})
             if not source:
                 return None
             
+            hit_id = hit.get('_id')
+            if isinstance(hit_id, str):
+                cache_key = (hit_id, zlib.crc32(orjson.dumps(source)))
+            else:
+                cache_key = None
+            if cache_key is not None:
+                cached = self._hit_cache.get(cache_key)
+                if cached is not None and time.monotonic() - cached[0] < self.CACHE_TTL:
+                    return cached[1]
+            
             # Extract mission information
             mission_data = source.get('Mission', {})
             if isinstance(mission_data, dict):
@@ -87,16 +600,23 @@ class NASAGeneLab:
             else:
                 mission_name = str(mission_data) if mission_data else 'Unknown Mission'
             
+            # Only build the placeholder id when there's no accession
+            if 'Accession' in source:
+                accession = source['Accession']
+            else:
+                accession = f"osdr-{hit.get('_id', 'unknown')}"
+            publications = source.get('Study Publication Title')
+            
             # Extract and format experiment data
             experiment = {
-                'id': source.get('Accession', f"osdr-{hit.get('_id', 'unknown')}"),
+                'id': accession,
                 'title': source.get('Study Title', 'Unknown Study'),
                 'summary': self._truncate_text(source.get('Study Description', ''), 500),
                 'organism': source.get('organism', 'Unknown organism'),
                 'mission': mission_name,
                 'keywords': self._extract_osdr_keywords(source),
                 'dataTypes': self._extract_osdr_data_types(source),
-                'publicationCount': len(source.get('Study Publication Title', []) if isinstance(source.get('Study Publication Title'), list) else []),
+                'publicationCount': len(publications) if isinstance(publications, list) else 0,
                 'duration': self._extract_osdr_duration(source),
                 'submissionDate': '',
                 'releaseDate': self._format_release_date(source.get('Study Public Release Date')),
@@ -111,13 +631,29 @@ class NASAGeneLab:
                 'authoritative_url': source.get('Authoritative Source URL', '')
             }
             
+            if cache_key is not None:
+                self._cache_hit(cache_key, experiment)
             return experiment
                     
         except Exception as e:
             logger.error(f"Error processing OSDR hit: {str(e)}")
             return None
     
-    async def _process_study(self, session: aiohttp.ClientSession, study: Dict) -> Optional[Dict[str, Any]]:
+    def _cache_hit(self, cache_key: Tuple[str, int], experiment: Dict[str, Any]):
+        """Remember a processed search hit, evicting the oldest past HIT_CACHE_SIZE
+        
+        Only single OrderedDict operations are used, so worker threads processing
+        different pages can share the cache.
+        """
+        self._hit_cache.pop(cache_key, None)
+        self._hit_cache[cache_key] = (time.monotonic(), experiment)
+        while len(self._hit_cache) > self.HIT_CACHE_SIZE:
+            try:
+                self._hit_cache.popitem(last=False)
+            except KeyError:
+                break
+    
+    async def _process_study(self, client: httpx.AsyncClient, study: Dict) -> Optional[Dict[str, Any]]:
         """Process individual study data (legacy method for fallback)"""
         try:
             accession = study.get('accession', '')
@@ -126,45 +662,48 @@ class NASAGeneLab:
             
             # Get detailed study information
             detail_url = f"{self.api_url}/{accession}"
-            async with session.get(detail_url) as response:
-                if response.status == 200:
-                    detail_data = await response.json()
-                    study_data = detail_data.get('study', {})
-                    
-                    # Extract and format experiment data
-                    experiment = {
-                        'id': accession,
-                        'title': study_data.get('title', 'Unknown Study'),
-                        'summary': study_data.get('description', '').strip()[:500] + '...' if len(study_data.get('description', '')) > 500 else study_data.get('description', ''),
-                        'organism': self._extract_organism(study_data),
-                        'mission': self._extract_mission(study_data),
-                        'keywords': self._extract_keywords(study_data),
-                        'dataTypes': self._extract_data_types(study_data),
-                        'publicationCount': len(study_data.get('publications', [])),
-                        'duration': self._extract_duration(study_data),
-                        'submissionDate': study_data.get('submissionDate', ''),
-                        'releaseDate': study_data.get('releaseDate', ''),
-                        'factors': self._extract_factors(study_data),
-                        'experimentPlatform': study_data.get('experimentPlatform', ''),
-                        'projectType': study_data.get('projectType', ''),
-                        'datasetSize': self._extract_dataset_size(study_data)
-                    }
-                    
-                    return experiment
-                else:
-                    logger.warning(f"Failed to get details for study {accession}")
-                    return self._create_basic_experiment(study)
-                    
+            status, detail_data = await self._get_json(client, detail_url)
+            
+            if status == 200:
+                study_data = detail_data.get('study', {})
+                description = study_data.get('description', '')
+                view = self._study_view(study_data)
+                
+                # Extract and format experiment data
+                experiment = {
+                    'id': accession,
+                    'title': study_data.get('title', 'Unknown Study'),
+                    'summary': description.strip()[:500] + '...' if len(description) > 500 else description,
+                    'organism': self._extract_organism(study_data),
+                    'mission': self._extract_mission(study_data, view),
+                    'keywords': self._extract_keywords(study_data, view),
+                    'dataTypes': self._extract_data_types(study_data),
+                    'publicationCount': len(study_data.get('publications', [])),
+                    'duration': self._extract_duration(view),
+                    'submissionDate': self._format_release_date(study_data.get('submissionDate')),
+                    'releaseDate': self._format_release_date(study_data.get('releaseDate')),
+                    'factors': view.factors,
+                    'experimentPlatform': study_data.get('experimentPlatform', ''),
+                    'projectType': study_data.get('projectType', ''),
+                    'datasetSize': self._extract_dataset_size(study_data)
+                }
+                
+                return experiment
+            else:
+                logger.warning(f"Failed to get details for study {accession}")
+                return self._create_basic_experiment(study)
+                
         except Exception as e:
             logger.error(f"Error processing study: {str(e)}")
             return self._create_basic_experiment(study)
     
     def _create_basic_experiment(self, study: Dict) -> Dict[str, Any]:
         """Create basic experiment from search result"""
+        description = study.get('description', '')
         return {
             'id': study.get('accession', 'Unknown'),
             'title': study.get('title', 'Unknown Study'),
-            'summary': study.get('description', '').strip()[:300] + '...' if len(study.get('description', '')) > 300 else study.get('description', ''),
+            'summary': description.strip()[:300] + '...' if len(description) > 300 else description,
             'organism': study.get('organism', 'Unknown'),
             'mission': 'NASA Mission',
             'keywords': [],
@@ -180,13 +719,38 @@ class NASAGeneLab:
             return organisms[0].get('scientificName', 'Unknown organism')
         return study_data.get('organism', 'Unknown organism')
     
-    def _extract_mission(self, study_data: Dict) -> str:
+    def _study_view(self, study_data: Dict) -> _StudyView:
+        """Lowercase the title and description, and scan the factors once"""
+        factor_keywords = []
+        mission_factor = duration_factor = None
+        factors = []
+        
+        for position, factor in enumerate(study_data.get('factors', [])):
+            factor_name = (factor.get('factorName') or '').lower()
+            if factor_name:
+                factor_keywords.append(factor_name)
+            if mission_factor is None and ('flight' in factor_name or 'mission' in factor_name):
+                mission_factor = factor
+            if duration_factor is None and ('duration' in factor_name or 'time' in factor_name):
+                duration_factor = factor
+            if position < 5:  # Limit to 5 factors
+                factors.append({
+                    'name': factor.get('factorName', ''),
+                    'value': factor.get('factorValue', '')
+                })
+        
+        return _StudyView(
+            text=f"{study_data.get('title', '')}\0{study_data.get('description', '')}".lower(),
+            factor_keywords=tuple(factor_keywords),
+            mission_factor=mission_factor,
+            duration_factor=duration_factor,
+            factors=factors
+        )
+    
+    def _extract_mission(self, study_data: Dict, view: _StudyView) -> str:
         """Extract mission information"""
-        factors = study_data.get('factors', [])
-        for factor in factors:
-            factor_name = factor.get('factorName', '').lower()
-            if 'flight' in factor_name or 'mission' in factor_name:
-                return factor.get('factorValue', 'NASA Mission')
+        if view.mission_factor is not None:
+            return view.mission_factor.get('factorValue', 'NASA Mission')
         
         # Check project info
         project = study_data.get('project', {})
@@ -195,16 +759,12 @@ class NASAGeneLab:
         
         return 'NASA Mission'
     
-    def _extract_keywords(self, study_data: Dict) -> List[str]:
+    def _extract_keywords(self, study_data: Dict, view: _StudyView) -> List[str]:
         """Extract relevant keywords"""
         keywords = []
         
         # From factors
-        factors = study_data.get('factors', [])
-        for factor in factors:
-            factor_name = factor.get('factorName', '')
-            if factor_name:
-                keywords.append(factor_name.lower())
+        keywords.extend(view.factor_keywords)
         
         # From study type
         study_type = study_data.get('studyType', '')
@@ -212,17 +772,9 @@ class NASAGeneLab:
             keywords.append(study_type.lower())
         
         # Add common space-related keywords based on content
-        title_lower = study_data.get('title', '').lower()
-        desc_lower = study_data.get('description', '').lower()
+        keywords.extend(match_study_space_keywords(view.text))
         
-        space_keywords = ['microgravity', 'spaceflight', 'space', 'ISS', 'gene expression', 
-                         'muscle atrophy', 'bone density', 'cardiovascular', 'radiation']
-        
-        for keyword in space_keywords:
-            if keyword in title_lower or keyword in desc_lower:
-                keywords.append(keyword)
-        
-        return list(set(keywords))[:10]  # Limit to 10 unique keywords
+        return list(dict.fromkeys(keywords))[:10]  # Limit to 10 unique keywords, first occurrence first
     
     def _extract_data_types(self, study_data: Dict) -> List[str]:
         """Extract data types"""
@@ -234,36 +786,23 @@ class NASAGeneLab:
             if assay_type:
                 data_types.append(assay_type)
         
-        return list(set(data_types))
+        return list(dict.fromkeys(data_types))
     
-    def _extract_duration(self, study_data: Dict) -> str:
+    def _extract_duration(self, view: _StudyView) -> str:
         """Extract study duration"""
-        factors = study_data.get('factors', [])
-        for factor in factors:
-            factor_name = factor.get('factorName', '').lower()
-            if 'duration' in factor_name or 'time' in factor_name:
-                return factor.get('factorValue', 'Unknown')
+        if view.duration_factor is not None:
+            return view.duration_factor.get('factorValue', 'Unknown')
         return 'Unknown'
     
-    def _extract_factors(self, study_data: Dict) -> List[Dict[str, str]]:
-        """Extract experimental factors"""
-        factors = study_data.get('factors', [])
-        return [
-            {
-                'name': factor.get('factorName', ''),
-                'value': factor.get('factorValue', '')
-            }
-            for factor in factors[:5]  # Limit to 5 factors
-        ]
-    
     def _extract_dataset_size(self, study_data: Dict) -> Optional[str]:
         """Extract dataset size information"""
         # This would need to be calculated from actual file sizes
         # For now, return estimated based on assay count
-        assays = study_data.get('assays', [])
-        if len(assays) > 10:
+        assays = study_data.get('assays')
+        assay_count = len(assays) if assays else 0
+        if assay_count > 10:
             return "Large (>1GB)"
-        elif len(assays) > 5:
+        elif assay_count > 5:
             return "Medium (100MB-1GB)"
         else:
             return "Small (<100MB)"
@@ -300,18 +839,11 @@ class NASAGeneLab:
             keywords.append(assay_type.lower())
         
         # Add space-related keywords based on content
-        title = source.get('Study Title', '').lower()
-        description = source.get('Study Description', '').lower()
-        
-        space_keywords = ['microgravity', 'spaceflight', 'space', 'ISS', 'bone', 
-                         'muscle', 'cardiovascular', 'radiation', 'gene expression',
-                         'inflammation', 'immune']
-        
-        for keyword in space_keywords:
-            if keyword in title or keyword in description:
-                keywords.append(keyword)
+        # Title and description are scanned as one NUL-separated string
+        text = f"{source.get('Study Title', '')}\0{source.get('Study Description', '')}".lower()
+        keywords.extend(match_osdr_space_keywords(text))
         
-        return list(set([k for k in keywords if k]))[:10]  # Remove empty and limit to 10
+        return list(dict.fromkeys(k for k in keywords if k))[:10]  # Remove empty and limit to 10
     
     def _extract_osdr_data_types(self, source: Dict) -> List[str]:
         """Extract data types from OSDR data"""
@@ -330,7 +862,7 @@ class NASAGeneLab:
         if measurement_type:
             data_types.append(measurement_type)
         
-        return list(set([dt for dt in data_types if dt]))
+        return list(dict.fromkeys(dt for dt in data_types if dt))
     
     def _extract_osdr_duration(self, source: Dict) -> str:
         """Extract duration from OSDR data"""
@@ -341,16 +873,11 @@ class NASAGeneLab:
             end_date = mission_data.get('End Date', '')
             if start_date and end_date:
                 try:
-                    from datetime import datetime
-                    # Handle different date formats
-                    for date_format in ['%d-%b-%Y', '%m/%d/%Y', '%Y-%m-%d']:
-                        try:
-                            start = datetime.strptime(start_date, date_format)
-                            end = datetime.strptime(end_date, date_format)
-                            duration = (end - start).days
-                            return f"{duration} days"
-                        except ValueError:
-                            continue
+                    start = parse_date(start_date)
+                    end = parse_date(end_date)
+                    if start is not None and end is not None:
+                        duration = (end - start).days
+                        return f"{duration} days"
                 except Exception:
                     pass
         
@@ -362,15 +889,18 @@ class NASAGeneLab:
         return 'Unknown'
     
     def _format_release_date(self, timestamp) -> str:
-        """Format release date from timestamp"""
+        """Format a release or submission date from a timestamp or date string
+        
+        Parseable dates are normalized to YYYY-MM-DD; anything else is returned as-is.
+        """
         if not timestamp:
             return ''
         try:
-            from datetime import datetime
             if isinstance(timestamp, (int, float)):
                 date = datetime.fromtimestamp(timestamp)
                 return date.strftime('%Y-%m-%d')
-            return str(timestamp)
+            date = parse_date(timestamp) if isinstance(timestamp, str) else None
+            return date.strftime('%Y-%m-%d') if date is not None else str(timestamp)
         except Exception:
             return str(timestamp) if timestamp else ''
     
@@ -408,225 +938,53 @@ class NASAGeneLab:
     def _estimate_dataset_size(self, source: Dict) -> str:
         """Estimate dataset size from OSDR data"""
         # Basic estimation based on assay types and material types
-        assay_types = [
+        assay_text = ' '.join((
             source.get('Study Assay Technology Type', ''),
             source.get('Study Assay Technology Platform', ''),
             source.get('Study Assay Measurement Type', '')
-        ]
-        
-        # High-data assays
-        high_data_types = ['rna-seq', 'microarray', 'proteomics', 'genomics', 'imaging']
-        medium_data_types = ['flow cytometry', 'pcr', 'biochemistry']
+        )).lower()
         
-        assay_text = ' '.join(assay_types).lower()
-        
-        if any(hdt in assay_text for hdt in high_data_types):
+        if _HIGH_DATA_ASSAY_RE.search(assay_text):
             return "Large (>1GB)"
-        elif any(mdt in assay_text for mdt in medium_data_types):
+        elif _MEDIUM_DATA_ASSAY_RE.search(assay_text):
             return "Medium (100MB-1GB)"
         else:
             return "Small (<100MB)"
     
     def _get_fallback_data(self) -> List[Dict[str, Any]]:
-        """Return enhanced fallback data when API fails"""
-        return [
-            {
-                'id': 'GLDS-21',
-                'title': 'Spaceflight Effects on Arabidopsis Gene Expression',
-                'summary': 'Investigation of how microgravity affects plant gene expression patterns in Arabidopsis thaliana during spaceflight missions.',
-                'organism': 'Arabidopsis thaliana',
-                'mission': 'STS-131',
-                'keywords': ['microgravity', 'gene expression', 'plants', 'spaceflight', 'arabidopsis'],
-                'dataTypes': ['RNA-Seq', 'Microarray'],
-                'publicationCount': 12,
-                'duration': '14 days',
-                'factors': [
-                    {'name': 'Spaceflight', 'value': 'Flight'},
-                    {'name': 'Duration', 'value': '14 days'}
-                ]
-            },
-            {
-                'id': 'GLDS-47',
-                'title': 'Muscle Atrophy in Microgravity',
-                'summary': 'Study of muscle protein degradation pathways in mouse models under simulated microgravity conditions.',
-                'organism': 'Mus musculus',
-                'mission': 'Rodent Research-1',
-                'keywords': ['muscle atrophy', 'microgravity', 'protein degradation', 'mice'],
-                'dataTypes': ['Proteomics', 'Histology'],
-                'publicationCount': 8,
-                'duration': '30 days',
-                'factors': [
-                    {'name': 'Microgravity', 'value': 'Simulated'},
-                    {'name': 'Duration', 'value': '30 days'}
-                ]
-            },
-            {
-                'id': 'GLDS-104',
-                'title': 'Cardiac Function in Space',
-                'summary': 'Analysis of cardiovascular adaptations and cardiac muscle changes during long-duration spaceflight.',
-                'organism': 'Homo sapiens',
-                'mission': 'ISS Expedition 42',
-                'keywords': ['cardiac', 'cardiovascular', 'spaceflight', 'adaptation'],
-                'dataTypes': ['Echocardiography', 'Blood Analysis'],
-                'publicationCount': 15,
-                'duration': '180 days',
-                'factors': [
-                    {'name': 'Spaceflight', 'value': 'Long-duration'},
-                    {'name': 'Environment', 'value': 'ISS'}
-                ]
-            },
-            {
-                'id': 'GLDS-78',
-                'title': 'Bone Density Loss Studies',
-                'summary': 'Investigation of bone mineral density changes and osteoblast activity in microgravity environments.',
-                'organism': 'Rattus norvegicus',
-                'mission': 'SpaceX CRS-12',
-                'keywords': ['bone density', 'osteoblast', 'calcium', 'microgravity'],
-                'dataTypes': ['X-ray', 'Biochemistry'],
-                'publicationCount': 6,
-                'duration': '60 days',
-                'factors': [
-                    {'name': 'Microgravity', 'value': 'True'},
-                    {'name': 'Duration', 'value': '60 days'}
-                ]
-            },
-            {
-                'id': 'GLDS-242',
-                'title': 'Space Radiation Effects on DNA',
-                'summary': 'Comprehensive analysis of DNA damage and repair mechanisms in response to cosmic radiation exposure.',
-                'organism': 'Homo sapiens',
-                'mission': 'ISS Expedition 55',
-                'keywords': ['radiation', 'DNA damage', 'cosmic rays', 'repair mechanisms'],
-                'dataTypes': ['Genomics', 'DNA-Seq'],
-                'publicationCount': 9,
-                'duration': '120 days',
-                'factors': [
-                    {'name': 'Radiation', 'value': 'Cosmic'},
-                    {'name': 'Duration', 'value': '120 days'}
-                ]
-            },
-            {
-                'id': 'GLDS-173',
-                'title': 'Plant Growth in Microgravity',
-                'summary': 'Study of plant root development and gravitropism responses in microgravity conditions.',
-                'organism': 'Zea mays',
-                'mission': 'ISS Expedition 48',
-                'keywords': ['plant growth', 'root development', 'gravitropism', 'microgravity'],
-                'dataTypes': ['Microscopy', 'Time-lapse Imaging'],
-                'publicationCount': 5,
-                'duration': '28 days',
-                'factors': [
-                    {'name': 'Gravity', 'value': 'Microgravity'},
-                    {'name': 'Plant Type', 'value': 'Corn'}
-                ]
-            },
-            {
-                'id': 'GLDS-195',
-                'title': 'Immune System Changes in Space',
-                'summary': 'Investigation of immune system adaptations and T-cell function during spaceflight missions.',
-                'organism': 'Homo sapiens',
-                'mission': 'ISS Various Expeditions',
-                'keywords': ['immune system', 't-cells', 'spaceflight', 'immunology'],
-                'dataTypes': ['Flow Cytometry', 'Immunoassays'],
-                'publicationCount': 11,
-                'duration': 'Variable',
-                'factors': [
-                    {'name': 'Environment', 'value': 'Spaceflight'},
-                    {'name': 'System', 'value': 'Immune'}
-                ]
-            },
-            {
-                'id': 'GLDS-158',
-                'title': 'Fruit Fly Development in Zero-G',
-                'summary': 'Analysis of developmental biology and genetic expression in Drosophila melanogaster under microgravity.',
-                'organism': 'Drosophila melanogaster',
-                'mission': 'SpaceX CRS-8',
-                'keywords': ['development', 'drosophila', 'genetics', 'zero gravity'],
-                'dataTypes': ['RNA-Seq', 'Developmental Assays'],
-                'publicationCount': 7,
-                'duration': '21 days',
-                'factors': [
-                    {'name': 'Gravity', 'value': 'Zero-G'},
-                    {'name': 'Stage', 'value': 'Development'}
-                ]
-            }
-        ]
+        """Return enhanced fallback data when API fails
+        
+        The same module-level list is returned on every call; treat it as read-only.
+        """
+        return FALLBACK_DATA
 
 # Singleton instance
 nasa_genelab = NASAGeneLab()
 
+# Only live API results are cached; fallback data is served uncached, so a
+# transient upstream failure is retried on the next call
+@async_ttl_cache(maxsize=32, ttl=600)
+async def _live_experiments(limit: int) -> Optional[List[Dict[str, Any]]]:
+    """Experiments from the OSDR API (cached for 10 minutes per limit), or None"""
+    return await nasa_genelab._search_osdr(DEFAULT_SEARCH_QUERY, limit)
+
+@async_ttl_cache(maxsize=256, ttl=300)
+async def _live_search(query: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+    """OSDR API search results (cached for 5 minutes per query and limit), or None"""
+    return await nasa_genelab._search_osdr(query, limit)
+
 async def get_experiments(limit: int = 20) -> List[Dict[str, Any]]:
     """Get experiments from NASA GeneLab API"""
-    return await nasa_genelab.fetch_experiments(limit)
+    experiments = await _live_experiments(limit)
+    if experiments is None:
+        logger.info("No studies from the OSDR API, using fallback data")
+        return nasa_genelab._get_fallback_data()
+    return experiments
 
 async def search_experiments(query: str, limit: int = 10) -> List[Dict[str, Any]]:
     """Search experiments by query"""
-    try:
-        async with aiohttp.ClientSession() as session:
-            search_params = {
-                'q': query,
-                'size': limit,
-                'from': 0
-            }
-            
-            async with session.get(nasa_genelab.search_url, params=search_params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Handle OSDR API response format
-                    hits_data = data.get('hits', {})
-                    if isinstance(hits_data, dict):
-                        total_hits = hits_data.get('total', {})
-                        if isinstance(total_hits, dict):
-                            total_count = total_hits.get('value', 0)
-                        else:
-                            total_count = total_hits
-                        
-                        study_hits = hits_data.get('hits', [])
-                    else:
-                        total_count = 0
-                        study_hits = []
-                    
-                    # If no hits, fall back to local search
-                    if total_count == 0 or not study_hits:
-                        fallback_data = nasa_genelab._get_fallback_data()
-                        query_lower = query.lower()
-                        return [
-                            exp for exp in fallback_data
-                            if query_lower in exp['title'].lower() or
-                               query_lower in exp['summary'].lower() or
-                               any(query_lower in keyword for keyword in exp['keywords']) or
-                               query_lower in exp['organism'].lower()
-                        ]
-                    
-                    experiments = []
-                    for hit in study_hits:
-                        experiment = nasa_genelab._process_osdr_hit(hit)
-                        if experiment:
-                            experiments.append(experiment)
-                    
-                    return experiments
-                else:
-                    # Fallback to filtering fallback data
-                    fallback_data = nasa_genelab._get_fallback_data()
-                    query_lower = query.lower()
-                    return [
-                        exp for exp in fallback_data
-                        if query_lower in exp['title'].lower() or
-                           query_lower in exp['summary'].lower() or
-                           any(query_lower in keyword for keyword in exp['keywords']) or
-                           query_lower in exp['organism'].lower()
-                    ]
-                    
-    except Exception as e:
-        logger.error(f"Error searching experiments: {str(e)}")
-        # Fallback search in local data
-        fallback_data = nasa_genelab._get_fallback_data()
-        query_lower = query.lower()
-        return [
-            exp for exp in fallback_data
-            if query_lower in exp['title'].lower() or
-               query_lower in exp['summary'].lower() or
-               any(query_lower in keyword for keyword in exp['keywords']) or
-               query_lower in exp['organism'].lower()
-        ]
\ No newline at end of file
+    experiments = await _live_search(query, limit)
+    if experiments is None:
+        # Fall back to searching the local data
+        return search_fallback_data(query)
+    return experiments
@@ -4,16 +4,114 @@ This would connect to actual NASA APIs for live data
 """
 import asyncio
 import aiohttp
-import json
+import ijson
+import orjson
+import random
+import sqlite3
+import time
+import zstandard
+from collections import deque
 from datetime import datetime
-from typing import List, Dict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import List, Dict, NamedTuple, Optional, Tuple
 import logging
 
+class _CachedPage(NamedTuple):
+    """A processed page of studies with the validators to revalidate it"""
+    # '' when the server sent none
+    etag: str
+    last_modified: str
+    experiments: List[Dict]
+
 class RealTimeNASACollector:
-    def __init__(self):
+    # Studies requested per page; the pages of one fetch are requested concurrently
+    PAGE_SIZE = 25
+    # Page requests in flight at once: starts at INITIAL and adapts (AIMD) between
+    # 1 and MAX, growing while responses beat TARGET_LATENCY and halving on overload
+    INITIAL_CONCURRENT_PAGES = 4
+    MAX_CONCURRENT_PAGES = 16
+    TARGET_LATENCY = 2.0
+    
+    # Attempts per page before giving up on a throttled, failing or unreachable API
+    MAX_ATTEMPTS = 5
+    # Longest exponential backoff between attempts, and longest server-requested pause honored
+    MAX_BACKOFF = 60.0
+    MAX_RETRY_AFTER = 300.0
+    # Most requests started in any RATE_WINDOW seconds
+    RATE_LIMIT = 60
+    RATE_WINDOW = 60.0
+    
+    def __init__(self, export_jsonl: bool = False):
         self.genelab_base = "https://genelab-data.ndc.nasa.gov/genelab/data/search"
         self.last_update = None
         self.logger = logging.getLogger(__name__)
+        
+        # Experiment store keyed by accession, opened on first write; each cycle
+        # also goes to data/live_experiments.jsonl.zst when export_jsonl is set
+        self.db_path = Path("data") / "experiments.db"
+        self._db: Optional[sqlite3.Connection] = None
+        # Accession -> release date of every stored experiment, loaded with the
+        # store, so studies unchanged since they were last written are skipped
+        self._stored_dates: Dict[str, Optional[str]] = {}
+        self.export_jsonl = export_jsonl
+        
+        # Shared HTTP session, created on first use inside the event loop and
+        # reused across collection cycles so connections are kept alive
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Adaptive limit on concurrent page requests, the requests holding a slot,
+        # and recent request latencies (seconds) it's tuned by. The condition that
+        # wakes requests waiting for a slot is created on first use inside the event loop
+        self._concurrency = float(self.INITIAL_CONCURRENT_PAGES)
+        self._in_flight = 0
+        self._latencies: deque = deque(maxlen=32)
+        self._slot_freed: Optional[asyncio.Condition] = None
+        
+        # (offset, size) -> last processed page, revalidated with a conditional GET
+        self._page_cache: Dict[Tuple[int, int], _CachedPage] = {}
+        # Set when a page comes back with new content rather than as a 304, so
+        # the collection loop can skip cycles in which nothing changed
+        self._catalog_changed = False
+        
+        # Start times of recent requests (monotonic, oldest first) for the sliding-window
+        # limit, and the time until which the server asked us to hold off
+        self._request_times: deque = deque()
+        self._throttled_until = 0.0
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it if needed"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                # Idle connections are kept well past aiohttp's 15 s default so a
+                # cycle's pages and retries reuse them; connections the server
+                # closed are reaped rather than left half-open
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=16,
+                    keepalive_timeout=600,
+                    enable_cleanup_closed=True,
+                    ttl_dns_cache=600
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared session and the experiment store"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            self._stored_dates = {}
     
     async def fetch_latest_experiments(self, limit: int = 50) -> List[Dict]:
         """
@@ -21,40 +119,230 @@ class RealTimeNASACollector:
         This is a conceptual implementation - actual API may differ
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                # Example API call structure (hypothetical)
-                params = {
-                    'term': 'spaceflight OR microgravity',
-                    'size': limit,
-                    'sort': 'releaseDate:desc',
-                    'format': 'json'
-                }
-                
-                async with session.get(self.genelab_base, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._process_genelab_data(data)
-                    else:
-                        self.logger.error(f"GeneLab API error: {response.status}")
-                        return []
+            session = await self._get_session()
+            
+            # Request all pages at once; a failed page ends the results there,
+            # so what's returned is always a prefix of the newest studies
+            pages = await asyncio.gather(
+                *(self._fetch_page(session, offset, min(self.PAGE_SIZE, limit - offset))
+                  for offset in range(0, limit, self.PAGE_SIZE)),
+                return_exceptions=True
+            )
+            
+            experiments = []
+            for page in pages:
+                if isinstance(page, BaseException):
+                    self.logger.error(f"Error fetching NASA data: {page}")
+                    break
+                if page is None:
+                    break
+                experiments.extend(page)
+            return experiments
         
         except Exception as e:
             self.logger.error(f"Error fetching NASA data: {e}")
             return []
     
-    def _process_genelab_data(self, raw_data: Dict) -> List[Dict]:
+    async def _fetch_page(self, session: aiohttp.ClientSession, offset: int, size: int) -> Optional[List[Dict]]:
         """
-        Process raw GeneLab data into our format
+        Fetch and process one page of the latest studies, or None if the request failed
+        
+        Pages fetched before are revalidated with If-None-Match/If-Modified-Since;
+        an unchanged page (304) is reused from the last cycle without reprocessing.
         """
-        processed = []
+        # Example API call structure (hypothetical)
+        params = {
+            'term': 'spaceflight OR microgravity',
+            'size': size,
+            'from': offset,
+            'sort': 'releaseDate:desc',
+            'format': 'json'
+        }
+        
+        cached = self._page_cache.get((offset, size))
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        
+        result = await self._get_with_retry(session, params, headers)
+        if result is None:
+            return None
+        status, studies, response_headers = result
+        if status == 304:
+            return cached.experiments if cached is not None else None
         
-        # This would parse the actual NASA API response
-        for study in raw_data.get('studies', []):
-            experiment = {
+        # Processing is CPU-bound, so it runs in a worker thread
+        self._catalog_changed = True
+        experiments = await asyncio.to_thread(self._process_genelab_data, studies)
+        etag = response_headers.get('ETag', '')
+        last_modified = response_headers.get('Last-Modified', '')
+        if etag or last_modified:
+            self._page_cache[(offset, size)] = _CachedPage(etag, last_modified, experiments)
+        return experiments
+    
+    async def _get_with_retry(self, session: aiohttp.ClientSession, params: Dict,
+                              headers: Dict[str, str]) -> Optional[Tuple[int, Optional[List[Dict]], Dict]]:
+        """
+        GET the search endpoint, retrying throttled (429), server-side (5xx) and
+        network failures with exponential backoff and jitter
+        
+        Returns the status, studies (None for a 304) and response headers of a
+        200 or 304, or None if the request failed.
+        """
+        for attempt in range(self.MAX_ATTEMPTS):
+            await self._wait_if_throttled()
+            await self._acquire_slot()
+            started = time.monotonic()
+            overloaded = True
+            try:
+                async with session.get(self.genelab_base, params=params, headers=headers or None) as response:
+                    self._note_rate_limit(response.headers)
+                    if response.status == 200:
+                        studies = await self._read_studies(response)
+                        overloaded = False
+                        return 200, studies, response.headers
+                    if response.status == 304:
+                        overloaded = False
+                        return 304, None, response.headers
+                    if response.status != 429 and response.status < 500:
+                        overloaded = False
+                        self.logger.error(f"GeneLab API error: {response.status}")
+                        return None
+                    error = f"status {response.status}"
+                    retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+                retry_after = None
+            finally:
+                # Backoff below happens without holding a slot
+                await self._release_slot(time.monotonic() - started, overloaded)
+            
+            if attempt + 1 == self.MAX_ATTEMPTS:
+                break
+            if retry_after is not None:
+                # The server said when to come back; hold off every request until then
+                self._throttled_until = max(self._throttled_until, time.monotonic() + retry_after)
+                delay = retry_after
+            else:
+                delay = min(self.MAX_BACKOFF, 2 ** attempt + random.random())
+            self.logger.warning(f"GeneLab API request failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        
+        self.logger.error(f"GeneLab API error: {error} after {self.MAX_ATTEMPTS} attempts")
+        return None
+    
+    async def _acquire_slot(self):
+        """
+        Wait for a free request slot under the adaptive concurrency limit
+        """
+        if self._slot_freed is None:
+            self._slot_freed = asyncio.Condition()
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(lambda: self._in_flight < int(self._concurrency))
+            self._in_flight += 1
+    
+    async def _release_slot(self, latency: float, overloaded: bool):
+        """
+        Free a request slot and adjust the concurrency limit from its outcome
+        
+        Additive increase: one more slot per window of fast responses. Multiplicative
+        decrease: half the slots on a throttled/failed request or a slow window.
+        """
+        self._latencies.append(latency)
+        if overloaded or sum(self._latencies) / len(self._latencies) > self.TARGET_LATENCY:
+            self._concurrency = max(1.0, self._concurrency / 2)
+            # Judge the reduced limit on fresh samples only
+            self._latencies.clear()
+        else:
+            self._concurrency = min(float(self.MAX_CONCURRENT_PAGES), self._concurrency + 1 / self._concurrency)
+        
+        async with self._slot_freed:
+            self._in_flight -= 1
+            self._slot_freed.notify_all()
+    
+    async def _wait_if_throttled(self):
+        """
+        Wait until a request may start under the sliding-window limit and any
+        pause the server asked for, then record its start
+        """
+        while True:
+            now = time.monotonic()
+            while self._request_times and now - self._request_times[0] >= self.RATE_WINDOW:
+                self._request_times.popleft()
+            
+            wait = self._throttled_until - now
+            if len(self._request_times) >= self.RATE_LIMIT:
+                wait = max(wait, self._request_times[0] + self.RATE_WINDOW - now)
+            if wait <= 0:
+                self._request_times.append(now)
+                return
+            await asyncio.sleep(wait)
+    
+    def _note_rate_limit(self, headers):
+        """
+        Pause preemptively when the server reports the rate-limit quota as used up
+        """
+        if headers.get('X-RateLimit-Remaining') != '0':
+            return
+        reset = headers.get('X-RateLimit-Reset', '')
+        try:
+            # Either seconds until the reset or its Unix time, depending on the server
+            seconds = float(reset)
+        except ValueError:
+            seconds = self.RATE_WINDOW
+        if seconds > 1e9:
+            seconds -= time.time()
+        pause = min(max(seconds, 0.0), self.MAX_RETRY_AFTER)
+        self._throttled_until = max(self._throttled_until, time.monotonic() + pause)
+    
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """
+        Seconds to wait from a Retry-After header (delay or HTTP date), capped at
+        MAX_RETRY_AFTER, or None if absent or unparseable
+        """
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0.0), self.MAX_RETRY_AFTER)
+    
+    async def _read_studies(self, response: aiohttp.ClientResponse) -> List[Dict]:
+        """
+        Stream-parse the studies of a page's JSON body as it arrives
+        
+        Each chunk is parsed on receipt, so decoding overlaps the download and
+        only the studies themselves, never the whole raw body, are held in memory.
+        """
+        studies = ijson.sendable_list()
+        parser = ijson.items_coro(studies, 'studies.item', use_float=True)
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            parser.send(chunk)
+        parser.close()
+        return list(studies)
+    
+    def _process_genelab_data(self, studies: List[Dict]) -> List[Dict]:
+        """
+        Process raw GeneLab studies into our format
+        """
+        # This would parse the actual NASA API response; one comprehension with the
+        # organism lookup inlined keeps the per-study work to plain dict gets
+        return [
+            {
                 'id': study.get('accession', 'UNKNOWN'),
                 'title': study.get('title', 'Untitled Study'),
                 'description': study.get('description', ''),
-                'organism': self._extract_organism(study),
+                'organism': (
+                    organisms[0].get('name', 'Unknown Organism')
+                    if (organisms := study.get('organisms')) else 'Unknown Organism'
+                ),
                 'mission': study.get('mission', 'Unknown Mission'),
                 'release_date': study.get('releaseDate'),
                 'data_types': study.get('assayTypes', []),
@@ -62,18 +350,8 @@ class RealTimeNASACollector:
                 'publication_count': len(study.get('publications', [])),
                 'dataset_size_gb': study.get('datasetSize', 0)
             }
-            processed.append(experiment)
-        
-        return processed
-    
-    def _extract_organism(self, study: Dict) -> str:
-        """
-        Extract organism name from study metadata
-        """
-        organisms = study.get('organisms', [])
-        if organisms:
-            return organisms[0].get('name', 'Unknown Organism')
-        return 'Unknown Organism'
+            for study in studies
+        ]
     
     async def start_real_time_collection(self, interval_minutes: int = 30):
         """
@@ -81,51 +359,140 @@ class RealTimeNASACollector:
         """
         self.logger.info("Starting real-time NASA data collection...")
         
+        # Cycles start on fixed monotonic boundaries, so the time a cycle takes
+        # doesn't push later ones back; a retry after an error doesn't move them
+        interval = interval_minutes * 60
+        next_cycle = time.monotonic()
+        
         while True:
+            if time.monotonic() >= next_cycle:
+                next_cycle += interval
+            failed = False
             try:
                 self.logger.info("Fetching latest NASA experiments...")
+                self._catalog_changed = False
                 new_experiments = await self.fetch_latest_experiments()
                 
-                if new_experiments:
+                # Pages are fetched conditionally, so an unchanged catalog comes back
+                # as 304s and there's nothing new to store
+                if new_experiments and self._catalog_changed:
                     await self._update_database(new_experiments)
-                    self.last_update = datetime.now()
                     self.logger.info(f"Updated {len(new_experiments)} experiments")
-                
-                # Wait for next update cycle
-                await asyncio.sleep(interval_minutes * 60)
+                elif new_experiments:
+                    self.logger.info("No changes since the last collection cycle")
                 
             except Exception as e:
                 self.logger.error(f"Error in collection cycle: {e}")
-                await asyncio.sleep(300)  # Wait 5 minutes on error
+                failed = True
+            
+            # A cycle that ran past the next boundary drops the cycles it overlapped
+            # instead of running them back to back
+            now = time.monotonic()
+            if next_cycle <= now:
+                missed = int((now - next_cycle) // interval) + 1
+                self.logger.warning(
+                    f"Collection cycle overran the {interval_minutes} minute interval, skipping {missed} cycle(s)"
+                )
+                next_cycle += missed * interval
+            
+            # Wait for next update cycle, or 5 minutes on error if that's sooner
+            wake = min(next_cycle, now + 300) if failed else next_cycle
+            await asyncio.sleep(wake - now)
     
     async def _update_database(self, experiments: List[Dict]):
         """
         Update database with new experiments
         In production, this would use a real database
         """
-        # Save to JSON file for demo
-        timestamp = datetime.now().isoformat()
-        data = {
-            'last_updated': timestamp,
-            'experiment_count': len(experiments),
-            'experiments': experiments
-        }
+        # One clock read per cycle, used for both the saved metadata and last_update
+        now = datetime.now()
+        
+        # Encoding and file I/O block, so they run in a worker thread and the
+        # event loop stays free for the next fetch
+        saved = await asyncio.to_thread(self._write_experiments, experiments, now.isoformat())
+        self.last_update = now
+        
+        self.logger.info(f"Saved {saved} of {len(experiments)} experiments to database")
+    
+    def _get_db(self) -> sqlite3.Connection:
+        """
+        Open the experiment store, creating it if needed
+        """
+        if self._db is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Writes happen in worker threads, one cycle at a time
+            self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS experiments "
+                "(id TEXT PRIMARY KEY, title TEXT, description TEXT, organism TEXT, mission TEXT, "
+                "release_date TEXT, updated_at TEXT, payload BLOB)"
+            )
+            self._stored_dates = dict(self._db.execute("SELECT id, release_date FROM experiments"))
+        return self._db
+    
+    def _write_experiments(self, experiments: List[Dict], timestamp: str) -> int:
+        """
+        Upsert new or re-released experiments into the store, and export them if
+        enabled; returns how many were written
+        """
+        db = self._get_db()
         
-        with open('data/live_experiments.json', 'w') as f:
-            json.dump(data, f, indent=2)
+        # A study whose accession and release date are already stored is taken as
+        # unchanged and not encoded again
+        stored = self._stored_dates.items()
+        experiments = [exp for exp in experiments if (exp['id'], exp['release_date']) not in stored]
+        if not experiments:
+            return 0
         
-        self.logger.info(f"Saved {len(experiments)} experiments to database")
+        # One transaction per cycle; only the fetched rows are written, and the
+        # full record is kept as JSON alongside the queryable columns
+        rows = [
+            (exp['id'], exp['title'], exp['description'], exp['organism'], exp['mission'],
+             exp['release_date'], timestamp, orjson.dumps(exp))
+            for exp in experiments
+        ]
+        with db:
+            db.executemany("INSERT OR REPLACE INTO experiments VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self._stored_dates.update((exp['id'], exp['release_date']) for exp in experiments)
+        
+        if self.export_jsonl:
+            self._export_jsonl(experiments, timestamp)
+        return len(experiments)
+    
+    def _export_jsonl(self, experiments: List[Dict], timestamp: str):
+        """
+        Append experiments to the compressed JSON Lines file and rewrite its metadata
+        """
+        # Append to a JSON Lines file for demo, one experiment per line, so each
+        # cycle writes only its own records rather than rewriting everything. Each
+        # cycle is its own zstd frame; concatenated frames decompress as one stream
+        lines = b''.join(orjson.dumps(exp, option=orjson.OPT_APPEND_NEWLINE) for exp in experiments)
+        with open('data/live_experiments.jsonl.zst', 'ab') as f:
+            f.write(zstandard.ZstdCompressor(level=3).compress(lines))
+        
+        # Collection metadata lives in a small sibling file
+        meta = {
+            'last_updated': timestamp,
+            'experiment_count': len(experiments)
+        }
+        with open('data/live_experiments.meta.json', 'wb') as f:
+            f.write(orjson.dumps(meta))
 
 # Usage example:
 async def main():
-    collector = RealTimeNASACollector()
-    
-    # One-time fetch
-    experiments = await collector.fetch_latest_experiments(10)
-    print(f"Fetched {len(experiments)} experiments")
-    
-    # Continuous collection (would run in background)
-    # await collector.start_real_time_collection(interval_minutes=30)
+    async with RealTimeNASACollector(export_jsonl=True) as collector:
+        # One-time fetch
+        experiments = await collector.fetch_latest_experiments(10)
+        print(f"Fetched {len(experiments)} experiments")
+        
+        # Continuous collection (would run in background)
+        # await collector.start_real_time_collection(interval_minutes=30)
 
 if __name__ == "__main__":
+    # Use libuv's event loop when available; it cuts per-callback overhead for socket I/O
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file